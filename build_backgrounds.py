@@ -0,0 +1,159 @@
+"""
+배경 이미지 정적 파일 생성 스크립트
+
+images/의 날씨 배경 이미지를 폭별로 줄여 WebP로 다시 압축하고, 큰 이미지를 받는 동안 보여줄
+아주 작은 흐린 미리보기를 만들어 static/backgrounds/에 저장합니다 (Pillow 필요).
+파일명에 내용 해시가 들어가므로 같은 주소의 파일은 바뀌지 않아 브라우저가 오래 캐시할 수 있습니다.
+앱은 시작할 때 manifest.json을 읽고, 없거나 원본 이미지가 바뀌었으면 한 번 다시 만듭니다.
+
+사용 예:
+    python build_backgrounds.py
+    python build_backgrounds.py --width 480 --width 960 --quality 75
+"""
+import argparse
+import base64
+import glob
+import hashlib
+import io
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE_DIR = os.path.join(BASE_DIR, "images")
+DEFAULT_OUTPUT_DIR = os.path.join(BASE_DIR, "static", "backgrounds")
+MANIFEST_NAME = "manifest.json"
+SOURCE_PATTERNS = ("*.jpeg", "*.jpg", "*.png")
+
+# 만들 폭 (원본보다 큰 폭은 원본 크기로 한 번만 만듦)
+DEFAULT_WIDTHS = [480, 1280]
+DEFAULT_QUALITY = 80
+
+# 미리보기 이미지 (CSS에 직접 넣으므로 수백 바이트 이내)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_BLUR = 1.5
+PLACEHOLDER_QUALITY = 40
+
+
+def list_sources(source_dir):
+    """배경 원본 이미지 경로 목록을 반환하는 함수"""
+    paths = set()
+    for pattern in SOURCE_PATTERNS:
+        paths.update(glob.glob(os.path.join(source_dir, pattern)))
+    return sorted(paths)
+
+
+def encode_webp(image, quality):
+    """Pillow 이미지를 WebP 바이트로 압축하는 함수"""
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=quality, method=6)
+    return buffer.getvalue()
+
+
+def resize_to_width(image, width):
+    """가로세로 비율을 유지하며 폭을 줄이는 함수 (원본보다 크게 만들지 않음)"""
+    from PIL import Image
+
+    if image.width <= width:
+        return image
+    return image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+
+
+def build_variants(source_path, output_dir, widths, quality):
+    """원본 이미지 하나의 WebP 변형과 흐린 미리보기를 만들고 manifest 항목을 반환하는 함수"""
+    from PIL import Image, ImageFilter
+
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    variants = []
+    with Image.open(source_path) as source:
+        image = source.convert("RGB")
+
+    for width in sorted({min(width, image.width) for width in widths}):
+        data = encode_webp(resize_to_width(image, width), quality)
+        file_name = f"{stem}-{width}.{hashlib.sha256(data).hexdigest()[:10]}.webp"
+        path = os.path.join(output_dir, file_name)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(data)
+        variants.append({"width": width, "file": file_name, "bytes": len(data)})
+
+    placeholder = resize_to_width(image, PLACEHOLDER_WIDTH).filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR))
+    stat = os.stat(source_path)
+    return {
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_bytes": stat.st_size,
+        "variants": variants,
+        "placeholder": "data:image/webp;base64," + base64.b64encode(encode_webp(placeholder, PLACEHOLDER_QUALITY)).decode(),
+    }
+
+
+def build_manifest(source_dir=DEFAULT_SOURCE_DIR, output_dir=DEFAULT_OUTPUT_DIR, widths=None, quality=DEFAULT_QUALITY):
+    """모든 배경 이미지의 변형을 만들고 manifest.json을 저장한 뒤 반환하는 함수"""
+    widths = widths or DEFAULT_WIDTHS
+    os.makedirs(output_dir, exist_ok=True)
+    images = {}
+    for source_path in list_sources(source_dir):
+        images[os.path.basename(source_path)] = build_variants(source_path, output_dir, widths, quality)
+
+    # 원본이 바뀌어 더 이상 쓰지 않는 이전 변형 삭제
+    used = {variant["file"] for entry in images.values() for variant in entry["variants"]}
+    for file_name in os.listdir(output_dir):
+        if file_name.endswith(".webp") and file_name not in used:
+            os.remove(os.path.join(output_dir, file_name))
+
+    manifest = {"version": 1, "widths": sorted(widths), "quality": quality, "images": images}
+    # 실행 중인 앱이 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, manifest_path)
+    return manifest
+
+
+def load_manifest(output_dir=DEFAULT_OUTPUT_DIR):
+    """저장된 manifest.json을 읽는 함수 (없거나 깨졌으면 None)"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_stale(manifest, source_dir=DEFAULT_SOURCE_DIR, output_dir=DEFAULT_OUTPUT_DIR):
+    """원본 이미지가 추가/변경/삭제되었거나 변형 파일이 없어졌는지 확인하는 함수"""
+    sources = {os.path.basename(path): path for path in list_sources(source_dir)}
+    images = manifest.get("images", {})
+    if set(sources) != set(images):
+        return True
+    for name, path in sources.items():
+        entry = images[name]
+        if os.stat(path).st_mtime_ns != entry.get("source_mtime_ns"):
+            return True
+        if not all(os.path.exists(os.path.join(output_dir, variant["file"])) for variant in entry["variants"]):
+            return True
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="배경 이미지 WebP 변형과 미리보기 생성")
+    parser.add_argument("--source-dir", default=DEFAULT_SOURCE_DIR, help="원본 배경 이미지 폴더")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="생성할 정적 파일 폴더 (앱 기준 static/ 아래)")
+    parser.add_argument("--width", type=int, action="append", help=f"만들 폭 (여러 번 지정 가능, 기본: {DEFAULT_WIDTHS})")
+    parser.add_argument("--quality", type=int, default=DEFAULT_QUALITY, help="WebP 품질 (0-100)")
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = build_manifest(args.source_dir, args.output_dir, args.width, args.quality)
+    except ImportError:
+        parser.error("배경 이미지를 만들려면 Pillow를 설치하세요 (pip install pillow)")
+
+    for name, entry in manifest["images"].items():
+        sizes = ", ".join(f"{variant['width']}px {variant['bytes'] / 1024:.0f}KB" for variant in entry["variants"])
+        print(f"{name}: {entry['source_bytes'] / 1024:.0f}KB -> {sizes}, 미리보기 {len(entry['placeholder'])}B", file=sys.stderr)
+    print(f"{len(manifest['images'])}개 이미지를 {args.output_dir}에 저장했습니다.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+지역 -> OpenWeather 도시 ID/좌표 변환표 생성 스크립트
+
+weather_core의 KOREAN_CITIES, 대안 도시명과 data/city_hierarchy.json에 있는 모든 지역을
+OpenWeather 현재 날씨 API로 한 번씩 조회하여 도시 ID와 위도/경도를 구하고,
+앱이 불러오는 압축 JSON 파일(data/city_table.json)로 저장합니다.
+
+변환표의 키는 지역 경로(예: '특별시/광역시>서울특별시>강남구>삼성동')이므로 같은 이름의 지역도 따로 저장되며,
+직접 찾지 못해 상위 지역의 값을 물려받은 항목은 출처가 'inherited'로 표시됩니다.
+
+사용 예:
+    # 실제 API로 생성하면서 응답을 기록
+    python build_city_table.py --record data/city_responses.json
+
+    # 기록된 응답만으로 오프라인 재생성 (네트워크 사용 안 함)
+    python build_city_table.py --replay data/city_responses.json
+
+    # 저장소에 포함된 작은 기록으로 재생 (테스트용)
+    python build_city_table.py --hierarchy tests/fixtures/city_hierarchy.json \
+        --replay tests/fixtures/city_responses.json --output /tmp/city_table.json
+
+    # 목(mock) 서버로 생성
+    python build_city_table.py --base-url http://localhost:8080/data/2.5/weather
+"""
+import argparse
+import ast
+import json
+import math
+import os
+import sys
+import time
+
+from weather_core import ALTERNATIVE_CITY_NAMES, CITY_TABLE_VERSION, KOREAN_CITIES, LocalityIndex
+
+DEFAULT_BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+DEFAULT_HIERARCHY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "city_hierarchy.json")
+DEFAULT_OUTPUT = os.path.join("data", "city_table.json")
+
+# 하위 지역 검색 결과가 상위 지역에서 이 거리(km) 이상 떨어져 있으면 동명이지로 보고 버림
+MAX_CHILD_DISTANCE_KM = 50
+
+def load_locality_data(source_paths=None, hierarchy_path=DEFAULT_HIERARCHY):
+    """지역 관련 딕셔너리와 지역 계층 파일을 읽어오는 함수 (source_paths를 주면 weather_core 대신 그 파일들의 리터럴을 사용)"""
+    with open(hierarchy_path, "r", encoding="utf-8") as f:
+        city_hierarchy = json.load(f)
+    if not source_paths:
+        return KOREAN_CITIES, ALTERNATIVE_CITY_NAMES, city_hierarchy
+
+    wanted = {"KOREAN_CITIES", "ALTERNATIVE_CITY_NAMES"}
+    found = {}
+    for source_path in source_paths:
+        with open(source_path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=source_path)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name) and target.id in wanted and target.id not in found:
+                        found[target.id] = ast.literal_eval(node.value)
+
+    missing = wanted - set(found)
+    if missing:
+        raise ValueError(f"{', '.join(source_paths)}에서 찾을 수 없는 데이터: {', '.join(sorted(missing))}")
+    return found["KOREAN_CITIES"], found["ALTERNATIVE_CITY_NAMES"], city_hierarchy
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """두 좌표 사이의 대원 거리(km)를 계산하는 함수"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+
+class Resolver:
+    """검색어를 (도시 ID, 위도, 경도)로 변환하는 클래스 (실제 API, 목 서버, 기록 재생 지원)"""
+
+    def __init__(self, base_url, api_key, replay=None, delay=0.0):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.replay = replay
+        self.delay = delay
+        self.recorded = {}
+        self._memo = {}
+        self._session = None
+
+    def _request(self, query):
+        """검색어 하나를 조회하여 (상태 코드, 응답 본문)을 반환"""
+        if self.replay is not None:
+            recorded = self.replay.get(query)
+            if recorded is None:
+                return 404, None
+            return recorded["status"], recorded.get("body")
+
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        params = {"q": query, "appid": self.api_key}
+        response = self._session.get(self.base_url, params=params, timeout=10)
+        body = response.json() if response.status_code == 200 else None
+        if self.delay:
+            time.sleep(self.delay)
+        return response.status_code, body
+
+    def resolve(self, query):
+        """검색어를 (도시 ID, 위도, 경도)로 변환하고, 실패하면 None 반환"""
+        if query in self._memo:
+            return self._memo[query]
+
+        status, body = self._request(query)
+        self.recorded[query] = {"status": status, "body": body}
+        result = None
+        if status == 200 and body and "id" in body and "coord" in body:
+            result = (body["id"], round(body["coord"]["lat"], 4), round(body["coord"]["lon"], 4))
+        self._memo[query] = result
+        return result
+
+    def resolve_first(self, queries):
+        """여러 후보 검색어 중 처음으로 성공한 결과를 반환"""
+        for query in queries:
+            result = self.resolve(query)
+            if result:
+                return result
+        return None
+
+
+def build_table(resolver, locality_index, log=None):
+    """모든 지역을 변환하여 {지역 경로: [도시 ID, 위도, 경도, 출처]} 딕셔너리를 만드는 함수
+
+    출처는 'resolved'(직접 찾음) 또는 'inherited'(상위 지역의 도시 ID/좌표를 물려받음)입니다.
+    """
+    table = {}
+    entries = {}  # 지역 ID -> 변환 결과
+    unresolved = []
+    roots = {locality.id for locality in locality_index.roots()}
+
+    # 상위 지역의 ID가 하위 지역보다 작으므로 ID 순서로 처리하면 상위 지역 결과가 먼저 준비됨
+    for locality_id in range(len(locality_index)):
+        locality = locality_index.get(locality_id)
+        if locality_id in roots:
+            # "경기도", "특별시/광역시" 같은 최상위 분류는 조회하지 않음
+            continue
+        parent = locality_index.parent(locality_id)
+        parent_entry = entries.get(parent.id) if parent is not None else None
+
+        if locality.query:
+            result = resolver.resolve_first(list(locality.alternatives) + [locality.query])
+        else:
+            result = resolver.resolve(f"{locality.name},KR")
+            # 같은 이름의 다른 지역이 검색된 경우 (예: 대전 동구의 삼성동을 찾았는데 강남구 삼성동이 나옴)
+            if result and parent_entry and distance_km(result[1], result[2], parent_entry[1], parent_entry[2]) > MAX_CHILD_DISTANCE_KM:
+                result = None
+
+        path_key = locality_index.path_key(locality_id)
+        if result:
+            entries[locality_id] = [*result, "resolved"]
+        elif parent_entry:
+            # 직접 찾을 수 없으면 상위 지역의 도시 ID/좌표를 물려받음
+            entries[locality_id] = [*parent_entry[:3], "inherited"]
+        else:
+            unresolved.append(path_key)
+            continue
+        table[path_key] = entries[locality_id]
+
+    if log and unresolved:
+        log(f"변환하지 못한 지역 {len(unresolved)}개: {', '.join(unresolved[:20])}{' ...' if len(unresolved) > 20 else ''}")
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지역명 -> OpenWeather 도시 ID/좌표 변환표 생성")
+    parser.add_argument("--source", action="append", help="weather_core 대신 지역 데이터를 읽을 소스 파일 경로 (테스트용, 여러 번 지정 가능)")
+    parser.add_argument("--hierarchy", default=DEFAULT_HIERARCHY, help="지역 계층 JSON 파일 경로")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="생성할 변환표 파일 경로")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="현재 날씨 API 주소 (목 서버 사용 시 변경)")
+    parser.add_argument("--record", help="API 응답을 기록할 JSON 파일 경로")
+    parser.add_argument("--replay", help="기록된 API 응답 JSON 파일 (지정 시 네트워크를 사용하지 않음)")
+    parser.add_argument("--delay", type=float, default=1.1, help="실제 API 요청 사이 대기 시간 (초, 무료 요금제 분당 한도 대비)")
+    args = parser.parse_args(argv)
+
+    replay = None
+    api_key = os.getenv("OPENWEATHER_API_KEY")
+    if args.replay:
+        with open(args.replay, "r", encoding="utf-8") as f:
+            replay = json.load(f)
+    elif not api_key:
+        parser.error("OPENWEATHER_API_KEY 환경변수가 필요합니다 (또는 --replay 사용)")
+
+    korean_cities, alternative_city_names, city_hierarchy = load_locality_data(args.source, args.hierarchy)
+    locality_index = LocalityIndex(city_hierarchy, korean_cities, alternative_city_names, {})
+    resolver = Resolver(args.base_url, api_key, replay=replay, delay=0.0 if replay is not None else args.delay)
+    table = build_table(resolver, locality_index, log=lambda message: print(message, file=sys.stderr))
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"version": CITY_TABLE_VERSION, "localities": table}, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"{len(table)}개 지역을 {args.output}에 저장했습니다.", file=sys.stderr)
+
+    if args.record:
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump(resolver.recorded, f, ensure_ascii=False, separators=(",", ":"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
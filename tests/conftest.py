@@ -0,0 +1,6 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(weather_core 등)을 설치 없이 import
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
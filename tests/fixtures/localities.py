@@ -0,0 +1,10 @@
+# build_city_table.py --source 로 읽는 작은 지역 데이터 (tests/fixtures/city_hierarchy.json과 함께 사용)
+KOREAN_CITIES = {
+    "서울": "Seoul,KR",
+    "대전": "Daejeon,KR",
+    "고성": "Goseong,KR",
+}
+
+ALTERNATIVE_CITY_NAMES = {
+    "고성": ["Goseong-gun,KR"],
+}
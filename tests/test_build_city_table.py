@@ -0,0 +1,48 @@
+import json
+import os
+
+import build_city_table
+from weather_core import LocalityIndex
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def build_fixture_table():
+    """저장소에 포함된 기록만으로 변환표를 만드는 함수 (네트워크 사용 안 함)"""
+    korean_cities, alternative_city_names, city_hierarchy = build_city_table.load_locality_data(
+        [os.path.join(FIXTURES_DIR, "localities.py")], os.path.join(FIXTURES_DIR, "city_hierarchy.json")
+    )
+    with open(os.path.join(FIXTURES_DIR, "city_responses.json"), "r", encoding="utf-8") as f:
+        replay = json.load(f)
+    locality_index = LocalityIndex(city_hierarchy, korean_cities, alternative_city_names, {})
+    resolver = build_city_table.Resolver(build_city_table.DEFAULT_BASE_URL, None, replay=replay)
+    return build_city_table.build_table(resolver, locality_index)
+
+
+def test_same_named_localities_are_kept_separately():
+    table = build_fixture_table()
+    assert table["특별시/광역시>서울특별시>강남구>삼성동"] == [1832006, 37.5145, 127.0595, "resolved"]
+    # 대전 삼성동 검색은 강남구 삼성동을 돌려주므로 버리고 상위 지역(대전)의 값을 물려받음
+    assert table["특별시/광역시>대전광역시>동구>삼성동"] == [1835235, 36.3214, 127.4197, "inherited"]
+    assert "강원도>고성군" in table and "경상남도>고성군" in table
+
+
+def test_unresolved_localities_are_marked_inherited():
+    table = build_fixture_table()
+    assert table["특별시/광역시>서울특별시>강남구>개포동"] == [1846002, 37.5172, 127.0473, "inherited"]
+    assert table["특별시/광역시>대전광역시>동구>판암동"][3] == "resolved"
+    # 대안 검색어가 404면 기본 검색어로 찾음
+    assert table["강원도>고성군"][:3] == [1842025, 38.3806, 128.4678]
+    assert table["강원도>고성군>간성읍"][3] == "inherited"
+    # 최상위 분류는 조회하지 않음
+    assert "강원도" not in table
+
+
+def test_locality_data_defaults_to_weather_core():
+    import weather_core
+
+    korean_cities, alternative_city_names, _ = build_city_table.load_locality_data(
+        hierarchy_path=os.path.join(FIXTURES_DIR, "city_hierarchy.json")
+    )
+    assert korean_cities is weather_core.KOREAN_CITIES
+    assert alternative_city_names is weather_core.ALTERNATIVE_CITY_NAMES
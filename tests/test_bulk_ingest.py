@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+import weather_core
+from weather_core import TTLCache, make_cache_key
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+BULK_FIXTURE = os.path.join(FIXTURES_DIR, "bulk_weather.json.gz")
+NOW = 1700000000  # 덤프 파일 레코드의 기준 시각
+
+
+@pytest.fixture
+def ingest(monkeypatch):
+    """변환표 없이 고정된 현재 시각으로 덤프 파일을 새 캐시에 적재하는 함수"""
+    monkeypatch.setattr(weather_core, "get_city_table", lambda: {})
+    monkeypatch.setattr(weather_core.time, "time", lambda: NOW)
+
+    def run(weather_cache=None, units="standard"):
+        weather_cache = weather_cache if weather_cache is not None else TTLCache(600, 100)
+        return weather_cache, weather_core.ingest_bulk_file(BULK_FIXTURE, weather_cache, units)
+    return run
+
+
+def test_bulk_records_keep_their_observation_time(ingest):
+    weather_cache, count = ingest()
+    # 서울 2건 중 최신 1건만 남고, TTL보다 오래된 부산, 한국 밖 도쿄, 관측 시각이 없는 대구는 건너뜀
+    assert count == 2
+    assert len(weather_cache._entries) == 1
+    weather_data, age = weather_cache.peek(make_cache_key({"q": "Seoul,KR"}))
+    assert age == 120
+    assert weather_cache.peek(make_cache_key({"q": "Busan,KR"})) == (None, None)
+    assert weather_cache.peek(make_cache_key({"q": "Daegu,KR"})) == (None, None)
+
+
+def test_bulk_records_do_not_replace_newer_cache_entries(ingest):
+    weather_cache = TTLCache(600, 100)
+    key = make_cache_key({"q": "Seoul,KR"})
+    weather_cache.set(key, "api", stored_at=NOW - 30)
+    _, count = ingest(weather_cache)
+    assert count == 0
+    assert weather_cache.peek(key) == ("api", 30)
+
+
+def test_bulk_temperatures_are_converted_to_metric(ingest):
+    weather_cache, _ = ingest()
+    weather_data, _ = weather_cache.peek(make_cache_key({"q": "Seoul,KR"}))
+    assert weather_data.temp == pytest.approx(12.0)
+    assert weather_data.feels_like == pytest.approx(10.5)
+    assert (weather_data.temp_min, weather_data.temp_max) == pytest.approx((10.0, 13.0))
+    assert weather_data.wind_speed == pytest.approx(3.1)
+
+
+def test_bulk_units_to_metric_handles_imperial():
+    data = weather_core.bulk_units_to_metric({"main": {"temp": 50.0}, "wind": {"speed": 10.0}}, "imperial")
+    assert data["main"]["temp"] == pytest.approx(10.0)
+    assert data["wind"]["speed"] == pytest.approx(4.47)
+    with pytest.raises(ValueError):
+        weather_core.bulk_units_to_metric({}, "kelvin")
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+import weather_core
+from weather_core import RateLimitExceeded
+
+
+class FakeCandidateMemory:
+    """성공/실패 기록만 모아 두는 가짜 학습 기록"""
+
+    def __init__(self, winner=None):
+        self.winner = winner
+        self.successes = []
+        self.failures = []
+
+    def plan(self, city_input, candidates):
+        return self.winner, [query for query in candidates if query != self.winner]
+
+    def record_success(self, city_input, query):
+        self.successes.append(query)
+
+    def record_failure(self, city_input, query):
+        self.failures.append(query)
+
+
+@pytest.fixture
+def candidate_memory(monkeypatch):
+    memory = FakeCandidateMemory()
+    monkeypatch.setattr(weather_core, "get_candidate_memory", lambda: memory)
+    return memory
+
+
+def fake_fetch(responses):
+    """검색어별로 (상태 코드, 데이터)를 돌려주거나 예외를 발생시키는 가짜 요청 함수"""
+    def fetch(query, priority):
+        response = responses[query]
+        if isinstance(response, Exception):
+            raise response
+        return response
+    return fetch
+
+
+def test_shed_candidate_does_not_abort_race(monkeypatch, candidate_memory):
+    monkeypatch.setattr(weather_core, "_fetch_candidate", fake_fetch({
+        "Goseong-gun,KR": RateLimitExceeded("호출 한도"),
+        "Goseong,KR": (200, "날씨"),
+    }))
+    assert weather_core.race_candidates("고성", ["Goseong-gun,KR", "Goseong,KR"]) == ("Goseong,KR", "날씨")
+    assert candidate_memory.successes == ["Goseong,KR"]
+
+
+def test_race_raises_only_when_every_candidate_is_shed(monkeypatch, candidate_memory):
+    monkeypatch.setattr(weather_core, "_fetch_candidate", fake_fetch({
+        "Goseong-gun,KR": RateLimitExceeded("호출 한도"),
+        "Goseong,KR": RateLimitExceeded("호출 한도"),
+        "Goseong-gun": (404, None),
+    }))
+    with pytest.raises(RateLimitExceeded):
+        weather_core.race_candidates("고성", ["Goseong-gun,KR", "Goseong,KR"])
+    # 404가 하나라도 있으면 호출 한도 문제가 아니므로 찾지 못한 것으로 처리
+    assert weather_core.race_candidates("고성", ["Goseong-gun,KR", "Goseong-gun"]) == (None, None)
+    assert candidate_memory.failures == ["Goseong-gun"]
+
+
+def test_alternative_search_shares_one_deadline(monkeypatch, candidate_memory):
+    def slow_fetch(query, priority):
+        time.sleep(0.5)
+        return 200, "날씨"
+
+    # 이전에 성공한 검색어가 제한 시간을 다 쓰면 나머지 후보는 시도하지 않음
+    candidate_memory.winner = "Goseong,KR"
+    monkeypatch.setattr(weather_core, "_fetch_candidate", slow_fetch)
+    start = time.monotonic()
+    assert weather_core.fetch_alternative_weather("고성", ["Goseong-gun,KR", "Goseong,KR"], deadline=0.2) is None
+    assert time.monotonic() - start < 0.35
@@ -0,0 +1,46 @@
+import pytest
+
+import weather_core
+from weather_core import geohash_encode, make_cache_key
+
+
+@pytest.mark.parametrize("lat, lon, precision, expected", [
+    (57.64911, 10.40744, 11, "u4pruydqqvj"),
+    (42.6, -5.6, 5, "ezs42"),
+    (-25.382708, -49.265506, 12, "6gkzwgjzn820"),
+    (37.5665, 126.978, 5, "wydm9"),
+    (0.0, 0.0, 1, "s"),
+    (-90.0, -180.0, 4, "0000"),
+    (89.999, 179.999, 4, "zzzz"),
+])
+def test_geohash_encode_matches_known_vectors(lat, lon, precision, expected):
+    assert geohash_encode(lat, lon, precision) == expected
+
+
+def test_geohash_prefix_is_the_coarser_cell():
+    assert geohash_encode(37.5665, 126.978, 7).startswith(geohash_encode(37.5665, 126.978, 5))
+
+
+@pytest.fixture
+def coordinates(monkeypatch):
+    """지역 좌표를 고정된 값으로 바꾸는 함수 (역삼동/도곡동은 같은 5자리 칸, 삼성동은 이웃 칸)"""
+    known = {"역삼동": (37.5006, 127.0366), "도곡동": (37.4906, 127.0450), "삼성동": (37.5145, 127.0595), "수원": (37.2636, 127.0286)}
+    monkeypatch.setattr(weather_core, "get_locality_coordinates", lambda city_input, locality_id=None: known.get(city_input))
+    return known
+
+
+def test_nearby_localities_share_one_cache_key(monkeypatch, coordinates):
+    monkeypatch.setattr(weather_core, "GEOHASH_PRECISION", 5)
+    _, params, key, point = weather_core.resolve_weather_request("역삼동")
+    assert params == {"lat": 37.5006, "lon": 127.0366}
+    assert point == coordinates["역삼동"]
+    assert key == make_cache_key({"geohash": geohash_encode(37.5006, 127.0366, 5)})
+    assert weather_core.resolve_weather_request("도곡동")[2] == key
+    assert weather_core.resolve_weather_request("삼성동")[2] != key
+
+
+def test_geohash_cache_is_off_by_default(monkeypatch, coordinates):
+    monkeypatch.setattr(weather_core, "GEOHASH_PRECISION", 0)
+    _, params, key, point = weather_core.resolve_weather_request("수원")
+    assert point is None
+    assert key == make_cache_key(params)
@@ -0,0 +1,59 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from weather_core import idw_interpolate
+
+# 서울 주변 관측 지점 4곳 (기온, 습도, 풍속, 기압)
+STATIONS = np.array([
+    (37.5665, 126.9780),
+    (37.4563, 126.7052),
+    (37.2636, 127.0286),
+    (37.6584, 127.0615),
+])
+VALUES = np.array([
+    (12.0, 40.0, 2.0, 1015.0),
+    (10.5, 65.0, 5.5, 1013.0),
+    (13.0, 45.0, 1.0, 1016.0),
+    (11.0, 50.0, 3.0, 1014.0),
+])
+
+
+def interpolate(lats, lons, **kwargs):
+    return idw_interpolate(np.asarray(lats), np.asarray(lons), STATIONS[:, 0], STATIONS[:, 1], VALUES, **kwargs)
+
+
+def test_exact_hit_returns_the_station_value():
+    estimates, confidence, estimated, nearest_km = interpolate(STATIONS[:, 0], STATIONS[:, 1])
+    np.testing.assert_allclose(estimates, VALUES)
+    assert (confidence == 1.0).all()
+    assert not estimated.any()
+    np.testing.assert_allclose(nearest_km, 0.0, atol=1e-6)
+
+
+def test_estimates_stay_within_station_range():
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(37.2, 37.7, 200)
+    lons = rng.uniform(126.6, 127.2, 200)
+    estimates, confidence, estimated, _ = interpolate(lats, lons)
+    assert estimated.all()
+    assert (estimates >= VALUES.min(axis=0) - 1e-9).all()
+    assert (estimates <= VALUES.max(axis=0) + 1e-9).all()
+    assert ((confidence > 0) & (confidence < 1)).all()
+
+
+def test_midpoint_of_two_stations_is_their_average():
+    estimates, _, _, _ = idw_interpolate(
+        np.array([37.5]), np.array([127.0]), np.array([37.4, 37.6]), np.array([127.0, 127.0]), np.array([10.0, 14.0])
+    )
+    assert estimates[0, 0] == pytest.approx(12.0)
+
+
+def test_targets_outside_the_radius_are_not_estimated():
+    # 부산은 서울 주변 관측 지점에서 반경(40km) 밖
+    estimates, confidence, _, nearest_km = interpolate([35.1796], [129.0756])
+    assert np.isnan(estimates).all()
+    assert (confidence == 0).all()
+    assert nearest_km[0] > 250
+    estimates, _, _, _ = idw_interpolate(np.array([37.5]), np.array([127.0]), np.array([]), np.array([]), np.empty((0, 4)))
+    assert np.isnan(estimates).all()
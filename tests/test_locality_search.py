@@ -0,0 +1,62 @@
+import pytest
+
+from weather_core import LocalityIndex, LocalitySearch
+
+HIERARCHY = {
+    "특별시/광역시": {
+        "서울특별시": {"강남구": {"동": ["역삼동", "삼성동", "신사동"]}},
+        "대전광역시": {"동구": {"동": ["삼성동"]}},
+    },
+    "경기도": {
+        "수원시": {"팔달구": {"동": ["인계동"]}},
+        "성남시": {"수정구": {"동": ["신흥동"]}},
+    },
+}
+KOREAN_CITIES = {"서울": "Seoul,KR", "대전": "Daejeon,KR", "수원": "Suwon,KR", "성남": "Seongnam,KR"}
+
+
+@pytest.fixture(scope="module")
+def search():
+    return LocalitySearch(LocalityIndex(HIERARCHY, KOREAN_CITIES, {}, {}))
+
+
+def names(localities):
+    return [locality.name for locality in localities]
+
+
+@pytest.mark.parametrize("query", ["ㅇㅅ", "역ㅅ", "역사", "역삼"])
+def test_choseong_and_jamo_prefixes_match_while_typing(search, query):
+    # 초성만, 또는 마지막 글자의 받침을 아직 입력하지 않은 상태에서도 찾음
+    assert names(search.search(query)) == ["역삼동"]
+
+
+def test_choseong_prefix_ignores_spaces(search):
+    assert names(search.search("ㅅ ㅅ")) == ["삼성동", "신사동", "삼성동"]
+
+
+def test_prefix_results_rank_cities_before_neighbourhoods(search):
+    # 검색어가 있는 도시, 상위 단계, 짧은 이름 순
+    assert names(search.search("ㅅ", limit=4)) == ["수원시", "성남시", "서울특별시", "수정구"]
+    assert names(search.search("신")) == ["신사동", "신흥동"]
+
+
+def test_same_named_localities_are_labelled_with_their_parents(search):
+    results = search.search("삼성동")
+    assert [search.label(locality) for locality in results] == ["삼성동 (서울특별시 강남구)", "삼성동 (대전광역시 동구)"]
+    assert search.label(search.search("역삼동")[0]) == "역삼동"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("역삼돔", ["역삼동"]),
+    ("섬남", ["성남시"]),
+    ("인게동", ["인계동"]),
+    ("삼성돔", ["삼성동", "삼성동"]),
+])
+def test_typos_fall_back_to_fuzzy_matches(search, query, expected):
+    assert names(search.search(query)) == expected
+
+
+def test_fuzzy_search_needs_enough_jamo(search):
+    # 자모 3개 미만은 오타 허용 검색을 하지 않음
+    assert search.search("쇼") == []
+    assert search.search("  ") == []
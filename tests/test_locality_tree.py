@@ -0,0 +1,64 @@
+import math
+import random
+
+import pytest
+
+from weather_core import LocalityTree, chord_to_km, to_unit_vector
+
+
+def random_points(seed, count):
+    """한국 주변과 날짜 변경선 부근에 흩어진 (이름, 위도, 경도) 목록을 만드는 함수"""
+    rng = random.Random(seed)
+    points = [(f"kr{i}", rng.uniform(33.0, 38.6), rng.uniform(124.5, 131.0)) for i in range(count)]
+    points += [(f"dl{i}", rng.uniform(-60.0, 60.0), rng.choice((-1, 1)) * rng.uniform(175.0, 180.0)) for i in range(count // 4)]
+    return points
+
+
+def brute_force(points, lat, lon):
+    """모든 지점까지의 (거리 km, 이름)을 가까운 순서로 반환하는 함수 (단위 벡터 직선 거리 기준)"""
+    target = to_unit_vector(lat, lon)
+    return sorted((chord_to_km(math.dist(target, to_unit_vector(point_lat, point_lon))), name)
+                  for name, point_lat, point_lon in points)
+
+
+@pytest.fixture(scope="module")
+def points():
+    return random_points(0, 400)
+
+
+@pytest.fixture(scope="module")
+def tree(points):
+    return LocalityTree(points)
+
+
+def queries(seed=1, count=50):
+    rng = random.Random(seed)
+    return [(rng.uniform(32.0, 39.0), rng.uniform(124.0, 132.0)) for _ in range(count)] + [(0.0, 179.9), (10.0, -179.9)]
+
+
+@pytest.mark.parametrize("k", [1, 5, 30])
+def test_nearest_matches_brute_force(points, tree, k):
+    for lat, lon in queries():
+        expected = brute_force(points, lat, lon)[:k]
+        result = tree.nearest(lat, lon, k=k)
+        assert [name for name, _ in result] == [name for _, name in expected]
+        assert [distance for _, distance in result] == pytest.approx([distance for distance, _ in expected])
+
+
+@pytest.mark.parametrize("radius_km", [0.0, 15.0, 80.0, 600.0])
+def test_within_matches_brute_force(points, tree, radius_km):
+    for lat, lon in queries():
+        expected = [(distance, name) for distance, name in brute_force(points, lat, lon) if distance <= radius_km]
+        result = tree.within(lat, lon, radius_km)
+        assert [name for name, _ in result] == [name for _, name in expected]
+        assert [distance for _, distance in result] == pytest.approx([distance for distance, _ in expected])
+
+
+def test_small_and_duplicate_trees():
+    assert LocalityTree([]).nearest(37.5, 127.0) == []
+    assert LocalityTree([]).within(37.5, 127.0, 100) == []
+    tree = LocalityTree([("a", 37.5, 127.0), ("b", 37.5, 127.0), ("c", 35.1, 129.0)])
+    assert len(tree) == 3
+    # k가 지역 수보다 크면 전부 반환
+    assert {name for name, _ in tree.nearest(37.5, 127.0, k=10)} == {"a", "b", "c"}
+    assert sorted(name for name, distance in tree.within(37.5, 127.0, 1) if distance == pytest.approx(0.0)) == ["a", "b"]
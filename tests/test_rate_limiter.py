@@ -0,0 +1,33 @@
+import threading
+import time
+
+from weather_core import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimiter
+
+
+def test_rate_limiter_rejects_after_burst():
+    rate_limiter = RateLimiter(rate_per_minute=1, burst=2)
+    assert rate_limiter.acquire(PRIORITY_INTERACTIVE, 0.0)
+    assert rate_limiter.acquire(PRIORITY_INTERACTIVE, 0.0)
+    assert not rate_limiter.acquire(PRIORITY_INTERACTIVE, 0.05)
+    stats = rate_limiter.stats()
+    assert (stats["granted"], stats["rejected"]) == (2, 1)
+
+
+def test_rate_limiter_serves_higher_priority_first():
+    rate_limiter = RateLimiter(rate_per_minute=600, burst=1)  # 0.1초마다 토큰 1개
+    assert rate_limiter.acquire(PRIORITY_INTERACTIVE, 0.0)
+    order = []
+
+    def wait_for_token(priority):
+        if rate_limiter.acquire(priority, 2.0):
+            order.append(priority)
+
+    # 낮은 우선순위 요청이 먼저 줄을 서도 다음 토큰은 높은 우선순위 요청이 받음
+    background = threading.Thread(target=wait_for_token, args=(PRIORITY_BACKGROUND,))
+    background.start()
+    time.sleep(0.02)
+    interactive = threading.Thread(target=wait_for_token, args=(PRIORITY_INTERACTIVE,))
+    interactive.start()
+    background.join()
+    interactive.join()
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND]
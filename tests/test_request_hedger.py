@@ -0,0 +1,51 @@
+import threading
+import time
+
+from weather_core import RequestHedger
+
+
+class SlowResponse:
+    """늦게 도착하는 가짜 응답"""
+
+    def close(self):
+        pass
+
+
+class SlowSession:
+    """모든 요청이 지연 시간 표본보다 늦게 끝나는 가짜 세션"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return SlowResponse()
+
+
+def make_hedger(budget_ratio):
+    """지연 시간 표본이 채워져 있어 바로 복제 요청을 고려하는 관리자를 만드는 함수"""
+    hedger = RequestHedger(percentile=0.5, budget_ratio=budget_ratio, min_samples=1, max_workers=4)
+    hedger._upstream_latency.extend([0.001] * 100)
+    return hedger
+
+
+def test_hedger_does_not_count_hedges_denied_by_rate_limit():
+    hedger = make_hedger(budget_ratio=1.0)
+    session = SlowSession()
+    for _ in range(5):
+        hedger.get(session, "url", {}, 1, lambda: False)
+    assert hedger.stats()["hedges"] == 0
+    assert session.calls == 5
+
+
+def test_hedger_respects_budget():
+    hedger = make_hedger(budget_ratio=0.5)
+    session = SlowSession()
+    for _ in range(4):
+        hedger.get(session, "url", {}, 1, lambda: True)
+    # 요청 4번에 복제 요청은 예산(50%)만큼 2번
+    assert hedger.stats()["hedges"] == 2
+    assert session.calls == 6
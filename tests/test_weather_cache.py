@@ -0,0 +1,36 @@
+import time
+
+from weather_core import TTLCache
+
+
+def test_cache_hits_misses_and_expiry():
+    weather_cache = TTLCache(ttl=60, max_size=10)
+    assert weather_cache.get("서울") is None
+    weather_cache.set("서울", "맑음")
+    weather_cache.set("부산", "흐림", stored_at=time.time() - 61)
+    assert weather_cache.get("서울") == "맑음"
+    # 만료된 값은 get으로는 보이지 않지만 peek으로는 경과 시간과 함께 남아 있음
+    assert weather_cache.get("부산") is None
+    value, age = weather_cache.peek("부산")
+    assert value == "흐림" and age >= 61
+    assert weather_cache.fresh_values() == ["맑음"]
+    stats = weather_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_cache_evicts_least_recently_used():
+    weather_cache = TTLCache(ttl=60, max_size=2)
+    weather_cache.set("서울", 1)
+    weather_cache.set("부산", 2)
+    weather_cache.get("서울")
+    weather_cache.set("대구", 3)
+    assert weather_cache.peek("부산") == (None, None)
+    assert weather_cache.get("서울") == 1 and weather_cache.get("대구") == 3
+
+
+def test_cache_set_entries_keeps_each_stored_at():
+    weather_cache = TTLCache(ttl=60, max_size=10)
+    now = time.time()
+    weather_cache.set_entries([("서울", "새 값", now - 10), ("부산", "오래된 값", now - 100)])
+    assert weather_cache.get("서울") == "새 값"
+    assert weather_cache.get("부산") is None
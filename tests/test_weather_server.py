@@ -0,0 +1,169 @@
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+import weather_server
+
+
+@pytest.fixture
+def server():
+    """포트 0에서 실행한 API 서버 (테스트가 끝나면 종료)"""
+    api_server = weather_server.make_server("127.0.0.1", 0, quiet=True)
+    thread = threading.Thread(target=api_server.serve_forever, daemon=True)
+    thread.start()
+    yield api_server
+    api_server.shutdown()
+    api_server.server_close()
+
+
+def request(api_server, method, path, body=None, headers=None):
+    """요청 하나를 보내고 (상태 코드, 응답 헤더, JSON 본문 또는 None)을 반환하는 함수"""
+    connection = http.client.HTTPConnection("127.0.0.1", api_server.server_port, timeout=5)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        data = response.read()
+        return response.status, response, json.loads(data) if data else None
+    finally:
+        connection.close()
+
+
+def test_weather_rejects_non_ascii_digit_id(server):
+    # "²"는 str.isdigit()이 참이지만 int()로 바꿀 수 없음
+    status, _, body = request(server, "GET", "/weather?id=%C2%B2")
+    assert status == 400
+    assert body["error"] == "id 파라미터가 올바르지 않습니다."
+
+
+@pytest.fixture
+def locality_tree(monkeypatch):
+    """좌표가 있는 지역 3곳으로 만든 KD 트리를 서버에서 쓰도록 바꾸는 함수"""
+    from weather_core import LocalityTree, get_locality_index
+
+    localities = [get_locality_index().find(name)[0] for name in ("서울", "수원", "용인")]
+    tree = LocalityTree([
+        (localities[0], 37.5665, 126.9780),
+        (localities[1], 37.2636, 127.0286),
+        (localities[2], 37.2411, 127.1776),
+    ])
+    monkeypatch.setattr(weather_server, "get_locality_tree", lambda: tree)
+    return tree
+
+
+def test_nearby_limit_is_clamped_and_validated(server, locality_tree):
+    path = "/nearby?lat=37.5665&lon=126.9780&radius=100"
+    status, _, body = request(server, "GET", path + "&limit=-3")
+    assert status == 200
+    assert [locality["name"] for locality in body["localities"]] == ["서울특별시"]
+    status, _, body = request(server, "GET", path + "&limit=2")
+    assert len(body["localities"]) == 2
+    status, _, body = request(server, "GET", path + "&limit=many")
+    assert status == 400
+    status, _, body = request(server, "GET", path + "&limit=%C2%B2")
+    assert status == 400
+
+
+def make_snapshot(**fields):
+    """테스트용 날씨 스냅샷을 만드는 함수"""
+    from weather_core import WeatherSnapshot
+
+    return WeatherSnapshot(**dict({"city_id": 1835848, "name": "Seoul", "lat": 37.566, "lon": 126.9784, "dt": 1700000000, "temp": 12.0}, **fields))
+
+
+def test_only_cached_snapshots_are_memoized():
+    weather_server.encode_cached_weather.cache_clear()
+    snapshot = make_snapshot()
+    first = weather_server.encode_weather("서울", "서울", snapshot)
+    assert weather_server.encode_weather("서울", "서울", snapshot) is first
+    # 요청마다 만드는 사본(오래된 값, 거리 표시)은 인코딩 캐시에 넣지 않음
+    stale_body = weather_server.encode_weather("서울", "서울", snapshot.with_stale_age(700))
+    assert json.loads(stale_body)["stale_age"] == 700
+    weather_server.encode_weather("서울", "서울", snapshot.with_distance(37.5, 127.0))
+    assert weather_server.encode_cached_weather.cache_info().currsize == 1
+
+
+@pytest.fixture
+def stub_fetch(monkeypatch):
+    """서버가 API 대신 고정된 스냅샷을 돌려주도록 바꾸고 요청된 지역 목록을 반환하는 함수"""
+    requested = []
+
+    def fetch_weather_data(city, refresh=False, locality_id=None):
+        requested.append(city)
+        return make_snapshot()
+
+    def fetch_weather_many(cities):
+        requested.extend(cities)
+        return {city: make_snapshot() for city in cities}, {}
+
+    monkeypatch.setattr(weather_server, "fetch_weather_data", fetch_weather_data)
+    monkeypatch.setattr(weather_server, "fetch_weather_many", fetch_weather_many)
+    monkeypatch.setattr(weather_server, "get_cached_many", lambda cities: ({}, list(cities)))
+    monkeypatch.setattr(weather_server, "cache_max_age", lambda city, locality_id=None: 300)
+    return requested
+
+
+def post_batch(api_server, body, headers=None):
+    """POST /weather/batch 요청을 소켓으로 그대로 보내는 함수 (headers로 Content-Length를 덮어쓸 수 있음)"""
+    headers = {"Content-Length": str(len(body))} if headers is None else headers
+    head = "POST /weather/batch HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items()) + "\r\n"
+    with socket.create_connection(("127.0.0.1", api_server.server_port), timeout=5) as connection:
+        connection.sendall(head.encode("utf-8") + body)
+        response = http.client.HTTPResponse(connection)
+        response.begin()
+        data = response.read()
+    return response.status, json.loads(data) if data else None
+
+
+def test_post_batch_validates_content_length(server, stub_fetch):
+    assert post_batch(server, b"", {})[0] == 411
+    assert post_batch(server, b"", {"Content-Length": "abc"})[0] == 400
+    assert post_batch(server, b"", {"Content-Length": "-1"})[0] == 400
+    assert post_batch(server, b"", {"Content-Length": "²"})[0] == 400
+    assert post_batch(server, b"", {"Content-Length": str(weather_server.API_MAX_BODY + 1)})[0] == 413
+    assert stub_fetch == []
+
+
+@pytest.mark.parametrize("body", [
+    b"not json",
+    b"[\"\\uc11c\\uc6b8\"]",
+    b"{\"cities\": \"\\uc11c\\uc6b8\"}",
+    b"{\"cities\": [1]}",
+    b"{\"region\": 5}",
+])
+def test_post_batch_rejects_invalid_bodies(server, stub_fetch, body):
+    status, response = post_batch(server, body)
+    assert status == 400
+    assert response["status"] == 400
+    assert stub_fetch == []
+
+
+def test_post_batch_returns_results(server, stub_fetch):
+    status, response = post_batch(server, json.dumps({"cities": ["서울", " 부산 ", ""]}).encode("utf-8"))
+    assert status == 200
+    assert set(response["results"]) == {"서울", "부산"}
+    assert stub_fetch == ["서울", "부산"]
+
+
+def test_weather_rejects_unknown_locality_id(server, stub_fetch):
+    status, _, _ = request(server, "GET", "/weather?id=99999999")
+    assert status == 400
+    status, _, _ = request(server, "GET", "/weather?id=-1")
+    assert status == 400
+    assert stub_fetch == []
+
+
+def test_weather_answers_matching_etag_with_304(server, stub_fetch):
+    status, response, body = request(server, "GET", "/weather?city=%EC%84%9C%EC%9A%B8")
+    assert status == 200 and body["query"] == "서울"
+    etag = response.getheader("ETag")
+    assert response.getheader("Cache-Control") == "public, max-age=300"
+
+    status, response, body = request(server, "GET", "/weather?city=%EC%84%9C%EC%9A%B8", headers={"If-None-Match": etag})
+    assert status == 304 and body is None
+    assert response.getheader("ETag") == etag
+    status, _, _ = request(server, "GET", "/weather?city=%EC%84%9C%EC%9A%B8", headers={"If-None-Match": 'W/"other"'})
+    assert status == 200
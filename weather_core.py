@@ -0,0 +1,2704 @@
+"""
+날씨 조회 핵심 모듈 (Streamlit 없이 import 가능)
+
+OpenWeather API 요청, 캐시, 지역명 변환 등 화면과 관계없는 기능을 모아 둔 모듈입니다.
+weather_app.py(Streamlit 화면)와 weather_export.py(일괄 내보내기 CLI)가 함께 사용합니다.
+"""
+import requests
+import json
+import math
+import time
+import os
+import asyncio
+import bisect
+import contextvars
+import functools
+import gzip
+import heapq
+import itertools
+import queue
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED, TimeoutError as FuturesTimeoutError
+from dotenv import load_dotenv
+
+# 빠른 JSON 파서 (설치되어 있으면 사용)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 환경변수 로드
+load_dotenv()
+
+# OpenWeather API 키 (환경변수에 없으면 set_api_key()로 설정)
+API_KEY = os.getenv("OPENWEATHER_API_KEY")
+
+# 데이터/캐시 파일의 기준 경로 (실행 위치와 관계없이 이 파일이 있는 폴더)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def set_api_key(api_key):
+    """환경변수 외의 곳(Streamlit secrets 등)에서 읽은 API 키를 설정하는 함수"""
+    global API_KEY
+    API_KEY = api_key
+
+def shared_resource(factory):
+    """factory를 처음 호출할 때 한 번만 만들어 프로세스 전체에서 공유하는 데코레이터
+    
+    import된 모듈은 Streamlit 재실행(rerun) 사이에도 유지되므로 모든 세션이 같은 객체를 사용합니다.
+    """
+    lock = threading.Lock()
+    instances = []
+    
+    @functools.wraps(factory)
+    def getter():
+        if not instances:
+            with lock:
+                if not instances:
+                    instances.append(factory())
+        return instances[0]
+    
+    return getter
+
+BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+GROUP_URL = "https://api.openweathermap.org/data/2.5/group"
+GROUP_BATCH_SIZE = 20  # group API 요청당 최대 도시 수
+
+def decode_json(content):
+    """API 응답 본문(bytes)을 파싱하는 함수 (orjson이 있으면 사용)"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def _validation_error(data):
+    """API 응답의 필수 정보를 확인하여 문제가 있으면 메시지, 없으면 None을 반환하는 함수"""
+    # 필수 필드 확인
+    required_fields = {
+        'name': '도시명',
+        'main': '기본 날씨 정보',
+        'weather': '날씨 상태',
+        'sys': '시스템 정보'
+    }
+    missing_fields = [description for field, description in required_fields.items() if field not in data]
+    if missing_fields:
+        return f"누락된 필수 정보: {', '.join(missing_fields)}"
+    
+    # main 필드 내부 확인
+    main_missing = [field for field in ['temp', 'humidity', 'pressure'] if field not in data['main']]
+    if main_missing:
+        return f"기본 날씨 정보 누락: {', '.join(main_missing)}"
+    
+    # weather 배열 확인
+    if not data['weather']:
+        return "날씨 상태 정보가 없습니다."
+    
+    return None
+
+def _intern(value):
+    """반복되는 문자열을 하나의 객체로 공유 (많은 스냅샷을 캐시할 때 메모리 절약)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class WeatherSnapshot:
+    """화면에 필요한 필드만 담은 현재 날씨 데이터 (API 응답을 한 번만 파싱/검증)"""
+    
+    __slots__ = (
+        'city_id', 'name', 'country', 'lat', 'lon', 'dt',
+        'temp', 'feels_like', 'temp_min', 'temp_max', 'humidity', 'pressure',
+        'wind_speed', 'wind_deg', 'weather_id', 'weather_main', 'description', 'icon',
+        'sunrise', 'sunset', 'visibility', 'clouds', 'rain_1h', 'snow_1h',
+        'missing_fields', 'validation_error', 'stale_age', 'distance_km'
+    )
+    
+    def __init__(self, **fields):
+        for field in self.__slots__:
+            setattr(self, field, fields.get(field))
+    
+    @classmethod
+    def from_api(cls, data):
+        """OpenWeather 현재 날씨 응답(dict)을 스냅샷으로 변환"""
+        main_data = data.get('main', {})
+        wind_data = data.get('wind', {})
+        sys_data = data.get('sys', {})
+        coord = data.get('coord', {})
+        weather_info = (data.get('weather') or [{}])[0]
+        temp = main_data.get('temp', 0)
+        visibility_raw = data.get('visibility', 0)
+        
+        return cls(
+            city_id=data.get('id'),
+            name=_intern(data.get('name', '알 수 없는 도시')),
+            country=_intern(sys_data.get('country', 'N/A')),
+            lat=coord.get('lat'),
+            lon=coord.get('lon'),
+            dt=data.get('dt'),
+            temp=temp,
+            feels_like=main_data.get('feels_like', temp),
+            temp_min=main_data.get('temp_min', temp),
+            temp_max=main_data.get('temp_max', temp),
+            humidity=main_data.get('humidity', 0),
+            pressure=main_data.get('pressure', 0),
+            wind_speed=wind_data.get('speed', 0),
+            wind_deg=wind_data.get('deg', 0),
+            weather_id=weather_info.get('id'),
+            weather_main=_intern(weather_info.get('main', 'Clear')),
+            description=_intern(weather_info.get('description', '정보 없음')),
+            icon=_intern(weather_info.get('icon', '01d')),
+            sunrise=sys_data.get('sunrise'),
+            sunset=sys_data.get('sunset'),
+            # 가시거리는 km로 변환
+            visibility=visibility_raw / 1000 if visibility_raw and visibility_raw > 0 else 0,
+            clouds=data.get('clouds', {}).get('all', 0),
+            rain_1h=data['rain'].get('1h', 0) if 'rain' in data else None,
+            snow_1h=data['snow'].get('1h', 0) if 'snow' in data else None,
+            missing_fields=tuple(field for field in ('name', 'main', 'weather', 'sys') if field not in data),
+            validation_error=_validation_error(data)
+        )
+    
+    @classmethod
+    def from_dict(cls, fields):
+        """to_dict()로 저장한 값을 스냅샷으로 복원"""
+        snapshot = cls(**fields)
+        snapshot.missing_fields = tuple(snapshot.missing_fields or ())
+        for field in ('name', 'country', 'weather_main', 'description', 'icon'):
+            setattr(snapshot, field, _intern(getattr(snapshot, field)))
+        return snapshot
+    
+    def to_dict(self):
+        """디스크 저장용 딕셔너리로 변환 (요청마다 달라지는 stale_age, distance_km 제외)"""
+        return {field: getattr(self, field) for field in self.__slots__ if field not in ('stale_age', 'distance_km')}
+    
+    def with_stale_age(self, age):
+        """경과 시간(초)을 표시한 사본 반환 (공유 캐시의 원본은 그대로 둠)"""
+        snapshot = WeatherSnapshot(**{field: getattr(self, field) for field in self.__slots__})
+        snapshot.stale_age = age
+        return snapshot
+    
+    def with_distance(self, lat, lon):
+        """요청 지점(lat, lon)에서 관측 지점까지의 거리(km)를 표시한 사본 반환"""
+        snapshot = WeatherSnapshot(**{field: getattr(self, field) for field in self.__slots__})
+        if self.lat is not None and self.lon is not None:
+            snapshot.distance_km = round(haversine_km(lat, lon, self.lat, self.lon), 2)
+        return snapshot
+
+# 날씨 응답 캐시 설정 (OpenWeather 현재 날씨는 약 10분 주기로 갱신됨)
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_CACHE_MAX_SIZE = int(os.getenv("WEATHER_CACHE_MAX_SIZE", "512"))
+
+class TTLCache:
+    """만료 시간(TTL)과 LRU 제거를 지원하는 스레드 안전 캐시
+    
+    store를 지정하면 저장하는 값을 디스크(SnapshotStore)에도 함께 기록합니다.
+    """
+    
+    def __init__(self, ttl, max_size, store=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (저장 시각, 값)
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """만료되지 않은 값을 반환하고, 없으면 None 반환"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                self.misses += 1
+                return None
+            # 최근 사용 항목을 맨 뒤로 이동 (LRU)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key, value, stored_at=None):
+        """값을 저장하고, 최대 크기를 넘으면 가장 오래 사용하지 않은 항목 제거"""
+        stored_at = time.time() if stored_at is None else stored_at
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        if self.store is not None:
+            self.store.save(key, value, stored_at)
+    
+    def set_many(self, items, stored_at=None):
+        """(키, 값) 목록을 한 번에 저장 (디스크에도 한 트랜잭션으로 기록)"""
+        stored_at = time.time() if stored_at is None else stored_at
+        self.set_entries([(key, value, stored_at) for key, value in items])
+    
+    def set_entries(self, entries):
+        """(키, 값, 저장 시각) 목록을 항목별 저장 시각 그대로 한 번에 저장 (디스크에도 한 트랜잭션으로 기록)"""
+        entries = sorted(entries, key=lambda entry: entry[2])
+        self.load(entries)
+        if self.store is not None and entries:
+            self.store.save_many(entries)
+    
+    def load(self, entries):
+        """(키, 값, 저장 시각) 목록을 디스크에 다시 기록하지 않고 채워 넣기 (오래된 것부터)"""
+        with self._lock:
+            for key, value, stored_at in entries:
+                self._entries[key] = (stored_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def fresh_values(self):
+        """만료되지 않은 모든 값 목록 반환 (LRU 순서와 통계는 바꾸지 않음)"""
+        now = time.time()
+        with self._lock:
+            return [value for stored_at, value in self._entries.values() if now - stored_at <= self.ttl]
+    
+    def peek(self, key):
+        """만료 여부와 관계없이 (값, 저장 후 경과 시간)을 반환 (통계에 포함하지 않음)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            return entry[1], time.time() - entry[0]
+    
+    def stats(self):
+        """캐시 적중/실패 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+# 디스크 스냅샷 캐시 설정 (빈 값이면 사용하지 않음)
+SNAPSHOT_DB_PATH = os.getenv("WEATHER_SNAPSHOT_DB", os.path.join(BASE_DIR, ".cache", "weather_snapshots.sqlite3"))
+SNAPSHOT_WARM_START_MAX_AGE = int(os.getenv("WEATHER_SNAPSHOT_WARM_START_MAX_AGE", "86400"))
+SNAPSHOT_RETENTION = 7 * 86400  # 이보다 오래된 스냅샷은 시작 시 삭제 (초)
+
+def _key_from_json(value):
+    """JSON으로 저장된 캐시 키(리스트)를 원래의 튜플 형태로 되돌리는 함수"""
+    if isinstance(value, list):
+        return tuple(_key_from_json(item) for item in value)
+    return value
+
+class SnapshotStore:
+    """날씨 스냅샷을 SQLite(WAL 모드)에 보관하는 디스크 캐시 클래스"""
+    
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, data TEXT NOT NULL)"
+        )
+        self._lock = threading.Lock()
+    
+    def save(self, key, value, stored_at):
+        """스냅샷 저장 (같은 키는 덮어씀)"""
+        self.save_many([(key, value, stored_at)])
+    
+    def save_many(self, entries):
+        """(키, 값, 저장 시각) 목록을 한 트랜잭션으로 저장"""
+        rows = [
+            (json.dumps(key, ensure_ascii=False), stored_at, json.dumps(value.to_dict(), ensure_ascii=False))
+            for key, value, stored_at in entries
+        ]
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO snapshots (key, stored_at, data) VALUES (?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            # 디스크 기록 실패는 메모리 캐시 동작에 영향을 주지 않음
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+    
+    def get(self, key):
+        """(값, 저장 시각)을 반환하고, 없으면 (None, None) 반환"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, stored_at FROM snapshots WHERE key = ?",
+                (json.dumps(key, ensure_ascii=False),)
+            ).fetchone()
+        if row is None:
+            return None, None
+        return WeatherSnapshot.from_dict(json.loads(row[0])), row[1]
+    
+    def load_recent(self, max_age, limit):
+        """최근 max_age초 안에 저장된 스냅샷을 오래된 것부터 최대 limit개 반환"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, data, stored_at FROM ("
+                "SELECT key, data, stored_at FROM snapshots WHERE stored_at >= ? "
+                "ORDER BY stored_at DESC LIMIT ?) ORDER BY stored_at",
+                (time.time() - max_age, limit)
+            ).fetchall()
+        return [
+            (_key_from_json(json.loads(key)), WeatherSnapshot.from_dict(json.loads(data)), stored_at)
+            for key, data, stored_at in rows
+        ]
+    
+    def prune(self, max_age):
+        """max_age초보다 오래된 스냅샷 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM snapshots WHERE stored_at < ?", (time.time() - max_age,))
+
+def open_snapshot_store():
+    """디스크 스냅샷 캐시를 여는 함수 (설정이 없거나 열 수 없으면 None)"""
+    if not SNAPSHOT_DB_PATH:
+        return None
+    try:
+        store = SnapshotStore(SNAPSHOT_DB_PATH)
+        store.prune(SNAPSHOT_RETENTION)
+        return store
+    except (OSError, sqlite3.Error):
+        return None
+
+@shared_resource
+def get_weather_cache():
+    """프로세스 전체에서 공유하는 날씨 응답 캐시를 반환하는 함수 (시작 시 디스크 스냅샷으로 채움)"""
+    store = open_snapshot_store()
+    weather_cache = TTLCache(WEATHER_CACHE_TTL, WEATHER_CACHE_MAX_SIZE, store)
+    if store is not None:
+        try:
+            weather_cache.load(store.load_recent(SNAPSHOT_WARM_START_MAX_AGE, WEATHER_CACHE_MAX_SIZE))
+        except (sqlite3.Error, ValueError, TypeError):
+            pass
+    
+    # 대량 덤프 파일이 지정되어 있으면 백그라운드에서 캐시에 적재
+    if BULK_WEATHER_FILE and os.path.exists(BULK_WEATHER_FILE):
+        threading.Thread(
+            target=ingest_bulk_file, args=(BULK_WEATHER_FILE, weather_cache), name="weather-bulk-ingest", daemon=True
+        ).start()
+    return weather_cache
+
+# HTTP 연결 풀 설정
+HTTP_POOL_SIZE = int(os.getenv("WEATHER_HTTP_POOL_SIZE", "10"))
+HTTP_KEEPALIVE_TIMEOUT = int(os.getenv("WEATHER_HTTP_KEEPALIVE_TIMEOUT", "60"))
+HTTP_PREWARM = os.getenv("WEATHER_HTTP_PREWARM", "1") == "1"
+
+def _prewarm_session(session):
+    """API 서버와 미리 TCP/TLS 연결을 맺어 두는 함수"""
+    try:
+        session.head("https://api.openweathermap.org", timeout=5)
+    except requests.exceptions.RequestException:
+        # 사전 연결 실패는 무시 (첫 요청 시 다시 연결됨)
+        pass
+
+@shared_resource
+def get_http_session():
+    """프로세스 전체에서 공유하는 keep-alive HTTP 세션을 반환하는 함수"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=HTTP_POOL_SIZE,
+        pool_block=False
+    )
+    session.mount("https://", adapter)
+    session.headers.update({
+        'Connection': 'keep-alive',
+        'Keep-Alive': f'timeout={HTTP_KEEPALIVE_TIMEOUT}'
+    })
+    
+    # 앱 시작 시 백그라운드에서 연결 미리 맺기
+    if HTTP_PREWARM:
+        threading.Thread(target=_prewarm_session, args=(session,), daemon=True).start()
+    
+    return session
+
+# API 호출 한도 설정 (무료 요금제 분당 60회)
+RATE_LIMIT_PER_MINUTE = int(os.getenv("WEATHER_RATE_LIMIT_PER_MINUTE", "60"))
+RATE_LIMIT_BURST = int(os.getenv("WEATHER_RATE_LIMIT_BURST", "10"))
+
+# 요청 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # main()에서의 사용자 검색
+PRIORITY_BATCH = 1        # 여러 지역 일괄 조회
+PRIORITY_BACKGROUND = 2   # 백그라운드 미리 갱신
+
+# 우선순위별 호출 한도 대기 최대 시간 (초), 넘으면 요청을 포기하고 캐시로 대체
+RATE_LIMIT_MAX_WAIT = {
+    PRIORITY_INTERACTIVE: 5.0,
+    PRIORITY_BATCH: 30.0,
+    PRIORITY_BACKGROUND: 0.0
+}
+
+class RateLimiter:
+    """토큰 버킷 방식으로 API 호출 수를 제한하고, 우선순위가 높은 요청부터 통과시키는 클래스"""
+    
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []  # (우선순위, 순번) 힙
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_queue_depth = 0
+    
+    def _refill(self, now):
+        """경과 시간만큼 토큰 보충"""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self, priority, timeout):
+        """토큰을 얻으면 True, 제한 시간 안에 얻지 못하면 False 반환"""
+        start = time.monotonic()
+        deadline = start + timeout
+        waiter = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiters, waiter)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._waiters[0] == waiter and self._tokens >= 1:
+                    self._tokens -= 1
+                    heapq.heappop(self._waiters)
+                    self.granted += 1
+                    self.total_wait += now - start
+                    self._cond.notify_all()
+                    return True
+                
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._waiters.remove(waiter)
+                    heapq.heapify(self._waiters)
+                    self.rejected += 1
+                    self._cond.notify_all()
+                    return False
+                
+                # 다음 토큰이 생길 때까지 (또는 앞 순서 요청이 끝날 때까지) 대기
+                until_next_token = max(0.0, (1 - self._tokens) / self.rate)
+                self._cond.wait(min(remaining, until_next_token) if until_next_token else remaining)
+    
+    def stats(self):
+        """대기열 길이와 대기 시간 통계 반환"""
+        with self._cond:
+            return {
+                'queue_depth': len(self._waiters),
+                'max_queue_depth': self.max_queue_depth,
+                'granted': self.granted,
+                'rejected': self.rejected,
+                'avg_wait': self.total_wait / self.granted if self.granted else 0.0,
+                'tokens': self._tokens
+            }
+
+@shared_resource
+def get_rate_limiter():
+    """프로세스 전체에서 공유하는 API 호출 한도 제한기를 반환하는 함수"""
+    return RateLimiter(RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST)
+
+class RateLimitExceeded(Exception):
+    """API 호출 한도 때문에 요청을 보내지 못했을 때 발생하는 예외"""
+
+# 현재 조회의 마감 시각 (time.monotonic 기준, 일괄 조회의 지역당 제한 시간)
+# 마감이 지나면 호출 한도를 기다리지 않으므로 제한 시간이 지나 버려진 작업이 호출 한도를 쓰지 않음
+_request_deadline = contextvars.ContextVar("weather_request_deadline", default=None)
+
+# 복제 요청(hedging) 설정
+HEDGE_ENABLED = os.getenv("WEATHER_HEDGE_ENABLED", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("WEATHER_HEDGE_PERCENTILE", "0.95"))  # 이 백분위 지연을 넘으면 복제 요청
+HEDGE_BUDGET_RATIO = float(os.getenv("WEATHER_HEDGE_BUDGET_RATIO", "0.05"))  # 전체 요청 대비 복제 요청 상한
+HEDGE_MIN_SAMPLES = 20  # 복제 기준을 정하기 위한 최소 지연 시간 표본 수
+
+def _percentile(samples, fraction):
+    """표본의 백분위 값 계산"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(fraction * len(ordered)))
+    return ordered[index]
+
+def _close_response(future):
+    """사용하지 않는 요청의 응답을 닫는 콜백"""
+    if future.exception() is None:
+        future.result().close()
+
+class RequestHedger:
+    """응답이 늦은 요청에 복제 요청을 보내 먼저 도착한 응답을 사용하는 클래스"""
+    
+    def __init__(self, percentile, budget_ratio, min_samples, max_workers):
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._upstream_latency = deque(maxlen=500)  # 개별 API 요청 지연 시간
+        self._observed_latency = deque(maxlen=500)  # 호출자가 실제로 기다린 시간
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather-hedge")
+    
+    def _timed_get(self, session, url, params, timeout):
+        """요청 하나를 보내고 지연 시간을 기록"""
+        start = time.monotonic()
+        response = session.get(url, params=params, timeout=timeout)
+        with self._lock:
+            self._upstream_latency.append(time.monotonic() - start)
+        return response
+    
+    def _hedge_delay(self):
+        """복제 요청을 보낼 대기 시간 (표본이 부족하면 None)"""
+        with self._lock:
+            if len(self._upstream_latency) < self.min_samples:
+                return None
+            return _percentile(self._upstream_latency, self.percentile)
+    
+    def _take_hedge_budget(self):
+        """복제 요청 예산이 남아 있으면 사용"""
+        with self._lock:
+            if self.hedges + 1 > self.budget_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+    
+    def _refund_hedge_budget(self):
+        """보내지 못한 복제 요청의 예산을 되돌림"""
+        with self._lock:
+            self.hedges -= 1
+    
+    def get(self, session, url, params, timeout, acquire_extra):
+        """필요하면 복제 요청을 보내며 GET 요청 (acquire_extra: 복제 요청용 호출 한도 확인 함수)"""
+        start = time.monotonic()
+        with self._lock:
+            self.requests += 1
+        
+        primary = self._executor.submit(self._timed_get, session, url, params, timeout)
+        delay = self._hedge_delay()
+        try:
+            response = primary.result(timeout=delay)
+        except FuturesTimeoutError:
+            # 예산을 먼저 잡고, 호출 한도 때문에 복제 요청을 보내지 못하면 되돌려 실제로 보낸 요청만 계산
+            hedged = self._take_hedge_budget()
+            if hedged and not acquire_extra():
+                self._refund_hedge_budget()
+                hedged = False
+            if hedged:
+                hedge = self._executor.submit(self._timed_get, session, url, params, timeout)
+                response = self._first_response(primary, hedge)
+            else:
+                response = primary.result()
+        
+        with self._lock:
+            self._observed_latency.append(time.monotonic() - start)
+        return response
+    
+    def _first_response(self, primary, hedge):
+        """두 요청 중 먼저 성공한 응답을 반환하고 나머지 응답은 버림"""
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    # 늦게 끝나는 요청의 응답은 연결 풀로 바로 반환
+                    for loser in pending:
+                        loser.add_done_callback(_close_response)
+                    return future.result()
+        # 두 요청 모두 실패하면 원래 요청의 예외를 발생
+        return primary.result()
+    
+    def stats(self):
+        """복제 요청 비율과 지연 시간 개선 통계 반환"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedges': self.hedges,
+                'hedge_rate': self.hedges / self.requests if self.requests else 0.0,
+                'hedge_wins': self.hedge_wins,
+                'upstream_p99': _percentile(self._upstream_latency, 0.99),
+                'observed_p99': _percentile(self._observed_latency, 0.99)
+            }
+
+@shared_resource
+def get_request_hedger():
+    """프로세스 전체에서 공유하는 복제 요청 관리자를 반환하는 함수"""
+    return RequestHedger(HEDGE_PERCENTILE, HEDGE_BUDGET_RATIO, HEDGE_MIN_SAMPLES, HTTP_POOL_SIZE * 2)
+
+def api_get(url, params, timeout, priority=PRIORITY_INTERACTIVE):
+    """호출 한도를 지키며 공유 HTTP 세션으로 OpenWeather API를 요청하는 함수"""
+    rate_limiter = get_rate_limiter()
+    max_wait = RATE_LIMIT_MAX_WAIT.get(priority, 0.0)
+    deadline = _request_deadline.get()
+    if deadline is not None:
+        max_wait = min(max_wait, deadline - time.monotonic())
+    if max_wait < 0 or not rate_limiter.acquire(priority, max_wait):
+        raise RateLimitExceeded("API 호출 한도를 초과했습니다. 잠시 후 다시 시도해주세요.")
+    
+    session = get_http_session()
+    if not HEDGE_ENABLED:
+        return session.get(url, params=params, timeout=timeout)
+    
+    # 복제 요청은 남는 호출 한도가 있을 때만 기다리지 않고 보냄
+    return get_request_hedger().get(
+        session, url, params, timeout, lambda: rate_limiter.acquire(priority, 0.0)
+    )
+
+# 동시 요청 합치기(single-flight) 잠금 분할 수
+SINGLE_FLIGHT_STRIPES = 64
+
+class _FlightCall:
+    """진행 중인 API 요청 하나의 결과를 기다리는 호출자들이 공유하는 객체"""
+    __slots__ = ('event', 'result', 'error')
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """같은 키에 대한 동시 요청을 하나로 합쳐 결과를 공유하는 클래스
+    
+    키별 잠금은 여러 개로 나누어(striping) 서로 다른 도시끼리 경합하지 않도록 합니다.
+    """
+    
+    def __init__(self, stripes):
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._calls = [{} for _ in range(stripes)]  # 잠금별 키 -> _FlightCall
+        self._coalesced = [0] * stripes
+    
+    def do(self, key, fn):
+        """같은 키의 요청이 진행 중이면 그 결과를 기다리고, 아니면 fn()을 실행"""
+        index = hash(key) % len(self._locks)
+        lock = self._locks[index]
+        calls = self._calls[index]
+        
+        with lock:
+            call = calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _FlightCall()
+                calls[key] = call
+            else:
+                self._coalesced[index] += 1
+        
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with lock:
+                del calls[key]
+            call.event.set()
+    
+    def stats(self):
+        """합쳐진 요청 수 반환"""
+        return {'coalesced': sum(self._coalesced)}
+
+@shared_resource
+def get_single_flight():
+    """프로세스 전체에서 공유하는 동시 요청 합치기 객체를 반환하는 함수"""
+    return SingleFlight(SINGLE_FLIGHT_STRIPES)
+
+# 대안 도시명 동시 시도 시 전체 제한 시간 (초)
+ALTERNATIVE_SEARCH_DEADLINE = 10
+
+# 대안 도시명 학습 기록 설정
+CANDIDATE_MEMORY_PATH = os.getenv("WEATHER_CANDIDATE_MEMORY_PATH", os.path.join(BASE_DIR, ".cache", "candidate_memory.json"))
+CANDIDATE_NEGATIVE_TTL = int(os.getenv("WEATHER_CANDIDATE_NEGATIVE_TTL", "86400"))
+
+class CandidateMemory:
+    """입력 도시명별로 성공한 검색어와 404가 난 검색어를 기억하는 클래스"""
+    
+    def __init__(self, path, negative_ttl):
+        self.path = path
+        self.negative_ttl = negative_ttl
+        self._winners = {}   # 입력 도시명 -> 성공한 검색어
+        self._failures = {}  # 입력 도시명 -> {검색어: 만료 시각}
+        self._lock = threading.Lock()
+        self._load()
+    
+    def _load(self):
+        """파일에 저장된 기록 불러오기"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._winners = data.get('winners', {})
+            self._failures = data.get('failures', {})
+        except (OSError, ValueError):
+            pass
+    
+    def _save(self):
+        """기록을 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({'winners': self._winners, 'failures': self._failures}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+    
+    def plan(self, city_input, candidates):
+        """(이전에 성공한 검색어, 나머지 시도할 검색어 목록)을 반환"""
+        now = time.time()
+        with self._lock:
+            winner = self._winners.get(city_input)
+            failures = self._failures.get(city_input, {})
+            if winner not in candidates:
+                winner = None
+            others = [
+                query for query in candidates
+                if query != winner and failures.get(query, 0) <= now
+            ]
+        return winner, others
+    
+    def record_success(self, city_input, query):
+        """성공한 검색어 기록"""
+        with self._lock:
+            if self._winners.get(city_input) == query:
+                return
+            self._winners[city_input] = query
+            self._failures.get(city_input, {}).pop(query, None)
+            self._save()
+    
+    def record_failure(self, city_input, query):
+        """404가 난 검색어를 만료 시각과 함께 기록"""
+        with self._lock:
+            if self._winners.get(city_input) == query:
+                del self._winners[city_input]
+            self._failures.setdefault(city_input, {})[query] = time.time() + self.negative_ttl
+            self._save()
+
+@shared_resource
+def get_candidate_memory():
+    """프로세스 전체에서 공유하는 대안 도시명 학습 기록을 반환하는 함수"""
+    return CandidateMemory(CANDIDATE_MEMORY_PATH, CANDIDATE_NEGATIVE_TTL)
+
+def _fetch_candidate(query, priority):
+    """후보 검색어 하나로 API를 요청하고 (상태 코드, 날씨 데이터)를 반환하는 함수"""
+    params = {
+        'q': query,
+        'appid': API_KEY,
+        'units': 'metric',
+        'lang': 'kr'
+    }
+    response = api_get(BASE_URL, params, ALTERNATIVE_SEARCH_DEADLINE, priority)
+    if response.status_code == 200:
+        return response.status_code, WeatherSnapshot.from_api(decode_json(response.content))
+    return response.status_code, None
+
+def race_candidates(city_input, candidates, priority=PRIORITY_INTERACTIVE, deadline=ALTERNATIVE_SEARCH_DEADLINE):
+    """여러 후보 검색어를 동시에 요청하여 가장 먼저 성공한 (검색어, 데이터)를 반환하는 함수
+    
+    호출 한도 때문에 보내지 못한 후보는 실패한 후보로 보고 나머지를 기다리며,
+    모든 후보가 호출 한도에 막혔을 때만 RateLimitExceeded를 발생시킵니다.
+    """
+    if not candidates:
+        return None, None
+    
+    candidate_memory = get_candidate_memory()
+    executor = ThreadPoolExecutor(max_workers=len(candidates))
+    # 호출한 쪽의 마감 시각(_request_deadline)을 각 요청 스레드에도 전달
+    futures = {
+        executor.submit(contextvars.copy_context().run, _fetch_candidate, query, priority): query
+        for query in candidates
+    }
+    shed = []  # 호출 한도 때문에 보내지 못한 후보의 예외
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            query = futures[future]
+            try:
+                status_code, weather_data = future.result()
+            except RateLimitExceeded as e:
+                shed.append(e)
+                continue
+            except (requests.exceptions.RequestException, ValueError):
+                continue
+            if weather_data:
+                candidate_memory.record_success(city_input, query)
+                return query, weather_data
+            if status_code == 404:
+                candidate_memory.record_failure(city_input, query)
+    except FuturesTimeoutError:
+        pass
+    finally:
+        # 아직 시작하지 않은 요청은 취소하고, 진행 중인 요청의 결과는 무시
+        executor.shutdown(wait=False, cancel_futures=True)
+    if len(shed) == len(futures):
+        raise shed[-1]
+    return None, None
+
+def fetch_alternative_weather(city_input, candidates, priority=PRIORITY_INTERACTIVE, deadline=ALTERNATIVE_SEARCH_DEADLINE):
+    """학습 기록을 참고하여 대안 도시명으로 날씨 데이터를 가져오는 함수 (전체 제한 시간 deadline초)"""
+    deadline_at = time.monotonic() + deadline
+    winner, others = get_candidate_memory().plan(city_input, candidates)
+    
+    # 이전에 성공한 검색어가 있으면 먼저 단독으로 시도 (정상 상태에서는 요청 1회)
+    if winner:
+        _, weather_data = race_candidates(city_input, [winner], priority, deadline)
+        if weather_data:
+            return weather_data
+    
+    # 404로 기록된 검색어를 제외한 나머지를 남은 시간 안에 동시에 시도
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        return None
+    _, weather_data = race_candidates(city_input, others, priority, remaining)
+    return weather_data
+
+# 지역 경로 -> OpenWeather 도시 ID/좌표 변환표 (build_city_table.py로 생성)
+CITY_TABLE_PATH = os.getenv("WEATHER_CITY_TABLE_PATH", os.path.join(BASE_DIR, "data", "city_table.json"))
+CITY_TABLE_VERSION = 2  # 1: 지역명 키 (같은 이름의 지역 구분 불가, 더 이상 읽지 않음)
+
+# 변환표 항목 하나 (inherited: 직접 찾지 못해 상위 지역의 도시 ID/좌표를 물려받은 항목)
+CityEntry = namedtuple('CityEntry', ['city_id', 'lat', 'lon', 'inherited'])
+
+@shared_resource
+def get_city_table():
+    """{지역 ID: CityEntry} 변환표를 불러오는 함수 (파일이 없거나 형식이 다르면 빈 딕셔너리)"""
+    try:
+        with open(CITY_TABLE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != CITY_TABLE_VERSION:
+        return {}
+    
+    # 파일의 키는 지역 경로이므로 지역 색인이 바뀌어도 같은 지역을 가리킴 (색인에 없는 경로는 무시)
+    locality_index = get_locality_index()
+    city_table = {}
+    for path_key, (city_id, lat, lon, source) in data.get('localities', {}).items():
+        locality = locality_index.by_path(path_key)
+        if locality is not None:
+            city_table[locality.id] = CityEntry(city_id, lat, lon, source == 'inherited')
+    return city_table
+
+def find_locality(city_input, locality_id=None):
+    """지역명(또는 지역 ID)에 해당하는 색인의 지역을 반환하는 함수 (같은 이름이 여러 개면 첫 번째, 없으면 None)"""
+    locality_index = get_locality_index()
+    if locality_id is not None:
+        return locality_index.get(locality_id)
+    localities = locality_index.find(city_input)
+    return localities[0] if localities else None
+
+def resolve_queryable_locality(city_input, locality_id=None):
+    """지역을 실제로 조회할 수 있는 가장 가까운 지역(자신 또는 상위 지역)으로 바꾸는 함수 (없으면 None)
+    
+    OpenWeather 검색어가 있거나 변환표에서 직접 찾은(물려받지 않은) 도시 ID가 있는 지역만 조회할 수 있습니다.
+    """
+    city_table = get_city_table()
+    locality_index = get_locality_index()
+    locality = find_locality(city_input, locality_id)
+    while locality is not None:
+        city_entry = city_table.get(locality.id)
+        if locality.query or (city_entry and not city_entry.inherited):
+            return locality
+        locality = locality_index.parent(locality.id)
+    return None
+
+def resolve_locality(city_input, locality_id=None):
+    """지역명(또는 지역 ID)을 실제로 조회할 지역명으로 바꾸는 함수
+    
+    동/읍/면처럼 OpenWeather 검색어도 변환표 항목도 없는 지역은 계층을 따라 올라가
+    가장 가까운 조회 가능한 상위 지역명을 반환합니다 (예: 역삼동 -> 강남구 또는 서울특별시).
+    색인에 없는 이름은 그대로 반환합니다.
+    """
+    locality = resolve_queryable_locality(city_input, locality_id)
+    return locality.name if locality else city_input
+
+def get_locality_coordinates(city_input, locality_id=None):
+    """도시 ID 변환표에서 지역의 (위도, 경도)를 찾는 함수 (없으면 가장 가까운 상위 지역, 그래도 없으면 None)"""
+    city_table = get_city_table()
+    locality_index = get_locality_index()
+    locality = find_locality(city_input, locality_id)
+    while locality is not None:
+        city_entry = city_table.get(locality.id)
+        if city_entry:
+            return city_entry.lat, city_entry.lon
+        locality = locality_index.parent(locality.id)
+    return None
+
+def resolve_location_params(city_input, locality_id=None):
+    """지역명(또는 지역 ID)을 API 검색 조건(도시 ID 또는 도시명)으로 변환하는 함수"""
+    locality = resolve_queryable_locality(city_input, locality_id)
+    if locality is None:
+        # 색인에 없거나 조회 가능한 상위 지역이 없으면 입력된 그대로 검색
+        return {'q': get_locality_index().query_for(city_input)}
+    city_entry = get_city_table().get(locality.id)
+    if city_entry and not city_entry.inherited:
+        return {'id': city_entry.city_id}
+    return {'q': locality.query}
+
+def make_cache_key(location_params, units='metric', lang='kr'):
+    """검색 조건으로 날씨 캐시 키를 만드는 함수"""
+    return (tuple(sorted(location_params.items())), units, lang)
+
+# 좌표 기반 캐시 설정 (0이면 사용 안 함, 5: 약 5km 칸, 6: 약 1km 칸)
+GEOHASH_PRECISION = int(os.getenv("WEATHER_GEOHASH_PRECISION", "0"))
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def geohash_encode(lat, lon, precision):
+    """위도/경도를 geohash 문자열로 변환하는 함수 (같은 칸의 지점은 같은 문자열)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 경도부터 번갈아 나눔
+    while len(chars) < precision:
+        value, value_range = (lon, lon_range) if even else (lat, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """두 좌표 사이의 대원 거리(km)를 계산하는 함수"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
+def resolve_weather_request(city_input, locality_id=None):
+    """지역명을 (조회용 지역명, API 검색 조건, 캐시 키, 요청 지점 좌표)로 변환하는 함수
+    
+    좌표 기반 캐시를 사용하고 지역 좌표를 알면 같은 geohash 칸의 지역이 캐시 키를 공유하고,
+    그렇지 않으면 동/읍/면을 상위 지역으로 바꾼 지역명 기준 캐시 키를 사용합니다 (좌표는 None).
+    """
+    if GEOHASH_PRECISION:
+        coordinates = get_locality_coordinates(city_input, locality_id)
+        if coordinates:
+            cell = geohash_encode(coordinates[0], coordinates[1], GEOHASH_PRECISION)
+            location_params = {'lat': coordinates[0], 'lon': coordinates[1]}
+            return city_input, location_params, make_cache_key({'geohash': cell}), coordinates
+    
+    location_params = resolve_location_params(city_input, locality_id)
+    return resolve_locality(city_input, locality_id), location_params, make_cache_key(location_params), None
+
+# 한국 도시명 매핑 (한글 -> 영문, 국가코드 포함)
+KOREAN_CITIES = {
+    # 특별시/광역시
+    "서울": "Seoul,KR",
+    "부산": "Busan,KR",
+    "대구": "Daegu,KR", 
+    "인천": "Incheon,KR",
+    "광주": "Gwangju,KR",
+    "대전": "Daejeon,KR",
+    "울산": "Ulsan,KR",
+    "세종": "Sejong,KR",
+    
+    # 경기도 (모든 시/군)
+    "수원": "Suwon,KR",
+    "성남": "Seongnam,KR",
+    "의정부": "Uijeongbu,KR",
+    "안양": "Anyang,KR",
+    "부천": "Bucheon,KR",
+    "광명": "Gwangmyeong,KR",
+    "평택": "Pyeongtaek,KR",
+    "과천": "Gwacheon,KR",
+    "오산": "Osan,KR",
+    "시흥": "Siheung,KR",
+    "군포": "Gunpo,KR",
+    "의왕": "Uiwang,KR",
+    "하남": "Hanam,KR",
+    "용인": "Yongin,KR",
+    "파주": "Paju,KR",
+    "이천": "Icheon,KR",
+    "안성": "Anseong,KR",
+    "김포": "Gimpo-si,KR",
+    "김포본동": "Gimpo,KR",
+    "장기본동": "Gimpo,KR",
+    "사우동": "Gimpo,KR",
+    "풍무동": "Gimpo,KR",
+    "장기동": "Gimpo,KR",
+    "구래동": "Gimpo,KR",
+    "마산동": "Gimpo,KR",
+    "운양동": "Gimpo,KR",
+    "통진읍": "Gimpo,KR",
+    "고촌읍": "Gimpo,KR",
+    "양촌읍": "Gimpo,KR",
+    "대곶면": "Gimpo,KR",
+    "월곶면": "Gimpo,KR",
+    "하성면": "Gimpo,KR",
+    "화성": "Hwaseong,KR",
+    "여주": "Yeoju,KR",
+    "양평": "Yangpyeong,KR",
+    "고양": "Goyang,KR",
+    "동두천": "Dongducheon,KR",
+    "가평": "Gapyeong,KR",
+    "연천": "Yeoncheon,KR",
+    "양주": "Yangju,KR",
+    "구리": "Guri,KR",
+    "남양주": "Namyangju,KR",
+    "포천": "Pocheon,KR",
+    
+    # 강원도
+    "춘천": "Chuncheon,KR",
+    "원주": "Wonju,KR",
+    "강릉": "Gangneung,KR",
+    "동해": "Donghae,KR",
+    "태백": "Taebaek,KR",
+    "속초": "Sokcho,KR",
+    "삼척": "Samcheok,KR",
+    "홍천": "Hongcheon,KR",
+    "횡성": "Hoengseong,KR",
+    "영월": "Yeongwol,KR",
+    "평창": "Pyeongchang,KR",
+    "정선": "Jeongseon,KR",
+    "철원": "Cheorwon,KR",
+    "화천": "Hwacheon,KR",
+    "양구": "Yanggu,KR",
+    "인제": "Inje,KR",
+    "고성": "Goseong,KR",
+    "양양": "Yangyang,KR",
+    
+    # 충청북도
+    "청주": "Cheongju,KR",
+    "충주": "Chungju,KR",
+    "제천": "Jecheon,KR",
+    "보은": "Boeun,KR",
+    "옥천": "Okcheon,KR",
+    "영동": "Yeongdong,KR",
+    "증평": "Jeungpyeong,KR",
+    "진천": "Jincheon,KR",
+    "괴산": "Goesan,KR",
+    "음성": "Eumseong,KR",
+    "단양": "Danyang,KR",
+    
+    # 충청남도
+    "천안": "Cheonan,KR",
+    "공주": "Gongju,KR",
+    "보령": "Boryeong,KR",
+    "아산": "Asan,KR",
+    "서산": "Seosan,KR",
+    "논산": "Nonsan,KR",
+    "계룡": "Gyeryong,KR",
+    "당진": "Dangjin,KR",
+    "금산": "Geumsan,KR",
+    "부여": "Buyeo,KR",
+    "서천": "Seocheon,KR",
+    "청양": "Cheongyang,KR",
+    "홍성": "Hongseong,KR",
+    "예산": "Yesan,KR",
+    "태안": "Taean,KR",
+    
+    # 전라북도
+    "전주": "Jeonju,KR",
+    "군산": "Gunsan,KR",
+    "익산": "Iksan,KR",
+    "정읍": "Jeongeup,KR",
+    "남원": "Namwon,KR",
+    "김제": "Gimje,KR",
+    "완주": "Wanju,KR",
+    "진안": "Jinan,KR",
+    "무주": "Muju,KR",
+    "장수": "Jangsu,KR",
+    "임실": "Imsil,KR",
+    "순창": "Sunchang,KR",
+    "고창": "Gochang,KR",
+    "부안": "Buan,KR",
+    
+    # 전라남도
+    "목포": "Mokpo,KR",
+    "여수": "Yeosu,KR",
+    "순천": "Suncheon,KR",
+    "나주": "Naju,KR",
+    "광양": "Gwangyang,KR",
+    "담양": "Damyang,KR",
+    "곡성": "Gokseong,KR",
+    "구례": "Gurye,KR",
+    "고흥": "Goheung,KR",
+    "보성": "Boseong,KR",
+    "화순": "Hwasun,KR",
+    "장흥": "Jangheung,KR",
+    "강진": "Gangjin,KR",
+    "해남": "Haenam,KR",
+    "영암": "Yeongam,KR",
+    "무안": "Muan,KR",
+    "함평": "Hampyeong,KR",
+    "영광": "Yeonggwang,KR",
+    "장성": "Jangseong,KR",
+    "완도": "Wando,KR",
+    "진도": "Jindo,KR",
+    "신안": "Sinan,KR",
+    
+    # 경상북도
+    "포항": "Pohang,KR",
+    "경주": "Gyeongju,KR",
+    "김천": "Gimcheon,KR",
+    "안동": "Andong,KR",
+    "구미": "Gumi,KR",
+    "영주": "Yeongju,KR",
+    "영천": "Yeongcheon,KR",
+    "상주": "Sangju,KR",
+    "문경": "Mungyeong,KR",
+    "경산": "Gyeongsan,KR",
+    "군위": "Gunwi,KR",
+    "의성": "Uiseong,KR",
+    "청송": "Cheongsong,KR",
+    "영양": "Yeongyang,KR",
+    "영덕": "Yeongdeok,KR",
+    "청도": "Cheongdo,KR",
+    "고령": "Goryeong,KR",
+    "성주": "Seongju,KR",
+    "칠곡": "Chilgok,KR",
+    "예천": "Yecheon,KR",
+    "봉화": "Bonghwa,KR",
+    "울진": "Uljin,KR",
+    "울릉": "Ulleung,KR",
+    
+    # 경상남도
+    "창원": "Changwon,KR",
+    "진주": "Jinju,KR",
+    "통영": "Tongyeong,KR",
+    "사천": "Sacheon,KR",
+    "김해": "Gimhae,KR",
+    "밀양": "Miryang,KR",
+    "거제": "Geoje,KR",
+    "양산": "Yangsan,KR",
+    "의령": "Uiryeong,KR",
+    "함안": "Haman,KR",
+    "창녕": "Changnyeong,KR",
+    "고성": "Goseong,KR",
+    "남해": "Namhae,KR",
+    "하동": "Hadong,KR",
+    "산청": "Sancheong,KR",
+    "함양": "Hamyang,KR",
+    "거창": "Geochang,KR",
+    "합천": "Hapcheon,KR",
+    
+    # 제주도
+    "제주": "Jeju,KR",
+    "서귀포": "Seogwipo,KR"
+}
+
+def get_korean_city_name(english_city_name):
+    """영문 도시명을 한글 도시명으로 변환하는 함수 (매핑에 없으면 원래 이름 반환)"""
+    return get_locality_index().korean_name(english_city_name)
+
+# 도시별 대안 이름 정의 (OpenWeather에서 이름이 여러 형태로 등록된 도시)
+ALTERNATIVE_CITY_NAMES = {
+    "김포": ["Gimpo-si,KR", "Gimpo,KR", "Gimpo-si", "Gimpo"],
+    "김포본동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "장기본동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "사우동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "풍무동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "장기동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "구래동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "마산동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "운양동": ["Gimpo,KR", "Gimpo-si,KR"],
+    "통진읍": ["Gimpo,KR", "Gimpo-si,KR"],
+    "고촌읍": ["Gimpo,KR", "Gimpo-si,KR"],
+    "양촌읍": ["Gimpo,KR", "Gimpo-si,KR"],
+    "대곶면": ["Gimpo,KR", "Gimpo-si,KR"],
+    "월곶면": ["Gimpo,KR", "Gimpo-si,KR"],
+    "하성면": ["Gimpo,KR", "Gimpo-si,KR"],
+    "화성": ["Hwaseong-si,KR", "Hwaseong,KR", "Hwaseong-si", "Hwaseong"],
+    "시흥": ["Siheung-si,KR", "Siheung,KR", "Siheung-si", "Siheung"],
+    "군포": ["Gunpo-si,KR", "Gunpo,KR", "Gunpo-si", "Gunpo"],
+    "의왕": ["Uiwang-si,KR", "Uiwang,KR", "Uiwang-si", "Uiwang"],
+    "하남": ["Hanam-si,KR", "Hanam,KR", "Hanam-si", "Hanam"],
+    "광명": ["Gwangmyeong-si,KR", "Gwangmyeong,KR", "Gwangmyeong-si", "Gwangmyeong"],
+    "평택": ["Pyeongtaek-si,KR", "Pyeongtaek,KR", "Pyeongtaek-si", "Pyeongtaek"],
+    "과천": ["Gwacheon-si,KR", "Gwacheon,KR", "Gwacheon-si", "Gwacheon"],
+    "오산": ["Osan-si,KR", "Osan,KR", "Osan-si", "Osan"],
+    "이천": ["Icheon-si,KR", "Icheon,KR", "Icheon-si", "Icheon"],
+    "안성": ["Anseong-si,KR", "Anseong,KR", "Anseong-si", "Anseong"],
+    "여주": ["Yeoju-si,KR", "Yeoju,KR", "Yeoju-si", "Yeoju"],
+    "양평": ["Yangpyeong-gun,KR", "Yangpyeong,KR", "Yangpyeong-gun", "Yangpyeong"],
+    "동두천": ["Dongducheon-si,KR", "Dongducheon,KR", "Dongducheon-si", "Dongducheon"],
+    "가평": ["Gapyeong-gun,KR", "Gapyeong,KR", "Gapyeong-gun", "Gapyeong"],
+    "연천": ["Yeoncheon-gun,KR", "Yeoncheon,KR", "Yeoncheon-gun", "Yeoncheon"],
+    "양주": ["Yangju-si,KR", "Yangju,KR", "Yangju-si", "Yangju"],
+    "구리": ["Guri-si,KR", "Guri,KR", "Guri-si", "Guri"],
+    "남양주": ["Namyangju-si,KR", "Namyangju,KR", "Namyangju-si", "Namyangju"],
+    "포천": ["Pocheon-si,KR", "Pocheon,KR", "Pocheon-si", "Pocheon"],
+    "춘천": ["Chuncheon-si,KR", "Chuncheon,KR", "Chuncheon-si", "Chuncheon"],
+    "원주": ["Wonju-si,KR", "Wonju,KR", "Wonju-si", "Wonju"],
+    "강릉": ["Gangneung-si,KR", "Gangneung,KR", "Gangneung-si", "Gangneung"],
+    "속초": ["Sokcho-si,KR", "Sokcho,KR", "Sokcho-si", "Sokcho"],
+    "동해": ["Donghae-si,KR", "Donghae,KR", "Donghae-si", "Donghae"],
+    "태백": ["Taebaek-si,KR", "Taebaek,KR", "Taebaek-si", "Taebaek"],
+    "평창": ["Pyeongchang-gun,KR", "Pyeongchang,KR", "Pyeongchang-gun", "Pyeongchang"],
+    "정선": ["Jeongseon-gun,KR", "Jeongseon,KR", "Jeongseon-gun", "Jeongseon"],
+    "청주": ["Cheongju-si,KR", "Cheongju,KR", "Cheongju-si", "Cheongju"],
+    "충주": ["Chungju-si,KR", "Chungju,KR", "Chungju-si", "Chungju"],
+    "천안": ["Cheonan-si,KR", "Cheonan,KR", "Cheonan-si", "Cheonan"],
+    "공주": ["Gongju-si,KR", "Gongju,KR", "Gongju-si", "Gongju"],
+    "보령": ["Boryeong-si,KR", "Boryeong,KR", "Boryeong-si", "Boryeong"],
+    "아산": ["Asan-si,KR", "Asan,KR", "Asan-si", "Asan"],
+    "서산": ["Seosan-si,KR", "Seosan,KR", "Seosan-si", "Seosan"],
+    "논산": ["Nonsan-si,KR", "Nonsan,KR", "Nonsan-si", "Nonsan"],
+    "전주": ["Jeonju-si,KR", "Jeonju,KR", "Jeonju-si", "Jeonju"],
+    "군산": ["Gunsan-si,KR", "Gunsan,KR", "Gunsan-si", "Gunsan"],
+    "익산": ["Iksan-si,KR", "Iksan,KR", "Iksan-si", "Iksan"],
+    "목포": ["Mokpo-si,KR", "Mokpo,KR", "Mokpo-si", "Mokpo"],
+    "여수": ["Yeosu-si,KR", "Yeosu,KR", "Yeosu-si", "Yeosu"],
+    "순천": ["Suncheon-si,KR", "Suncheon,KR", "Suncheon-si", "Suncheon"],
+    "나주": ["Naju-si,KR", "Naju,KR", "Naju-si", "Naju"],
+    "광양": ["Gwangyang-si,KR", "Gwangyang,KR", "Gwangyang-si", "Gwangyang"],
+    "포항": ["Pohang-si,KR", "Pohang,KR", "Pohang-si", "Pohang"],
+    "경주": ["Gyeongju-si,KR", "Gyeongju,KR", "Gyeongju-si", "Gyeongju"],
+    "김천": ["Gimcheon-si,KR", "Gimcheon,KR", "Gimcheon-si", "Gimcheon"],
+    "안동": ["Andong-si,KR", "Andong,KR", "Andong-si", "Andong"],
+    "구미": ["Gumi-si,KR", "Gumi,KR", "Gumi-si", "Gumi"],
+    "창원": ["Changwon-si,KR", "Changwon,KR", "Changwon-si", "Changwon"],
+    "진주": ["Jinju-si,KR", "Jinju,KR", "Jinju-si", "Jinju"],
+    "통영": ["Tongyeong-si,KR", "Tongyeong,KR", "Tongyeong-si", "Tongyeong"],
+    "제주": ["Jeju-si,KR", "Jeju,KR", "Jeju-si", "Jeju"],
+    "서귀포": ["Seogwipo-si,KR", "Seogwipo,KR", "Seogwipo-si", "Seogwipo"]
+}
+
+# 영문 도시명 -> 한글 도시명 (OpenWeather 응답의 도시명 표시용)
+ENGLISH_TO_KOREAN = {
+    'Seoul': '서울',
+    'Busan': '부산',
+    'Daegu': '대구',
+    'Incheon': '인천',
+    'Gwangju': '광주',
+    'Daejeon': '대전',
+    'Ulsan': '울산',
+    'Sejong': '세종',
+    'Suwon': '수원',
+    'Seongnam': '성남',
+    'Uijeongbu': '의정부',
+    'Anyang': '안양',
+    'Bucheon': '부천',
+    'Gwangmyeong': '광명',
+    'Pyeongtaek': '평택',
+    'Gwacheon': '과천',
+    'Osan': '오산',
+    'Siheung': '시흥',
+    'Gunpo': '군포',
+    'Uiwang': '의왕',
+    'Hanam': '하남',
+    'Yongin': '용인',
+    'Paju': '파주',
+    'Icheon': '이천',
+    'Anseong': '안성',
+    'Gimpo-si': '김포',
+    'Gimpo': '김포',
+    'Hwaseong-si': '화성',
+    'Siheung-si': '시흥',
+    'Gunpo-si': '군포',
+    'Uiwang-si': '의왕',
+    'Hanam-si': '하남',
+    'Gwangmyeong-si': '광명',
+    'Pyeongtaek-si': '평택',
+    'Gwacheon-si': '과천',
+    'Osan-si': '오산',
+    'Icheon-si': '이천',
+    'Anseong-si': '안성',
+    'Yeoju-si': '여주',
+    'Yangpyeong-gun': '양평',
+    'Dongducheon-si': '동두천',
+    'Gapyeong-gun': '가평',
+    'Yeoncheon-gun': '연천',
+    'Yangju-si': '양주',
+    'Guri-si': '구리',
+    'Namyangju-si': '남양주',
+    'Pocheon-si': '포천',
+    'Chuncheon-si': '춘천',
+    'Wonju-si': '원주',
+    'Gangneung-si': '강릉',
+    'Sokcho-si': '속초',
+    'Donghae-si': '동해',
+    'Taebaek-si': '태백',
+    'Pyeongchang-gun': '평창',
+    'Jeongseon-gun': '정선',
+    'Cheongju-si': '청주',
+    'Chungju-si': '충주',
+    'Cheonan-si': '천안',
+    'Gongju-si': '공주',
+    'Boryeong-si': '보령',
+    'Asan-si': '아산',
+    'Seosan-si': '서산',
+    'Nonsan-si': '논산',
+    'Jeonju-si': '전주',
+    'Gunsan-si': '군산',
+    'Iksan-si': '익산',
+    'Mokpo-si': '목포',
+    'Yeosu-si': '여수',
+    'Suncheon-si': '순천',
+    'Naju-si': '나주',
+    'Gwangyang-si': '광양',
+    'Pohang-si': '포항',
+    'Gyeongju-si': '경주',
+    'Gimcheon-si': '김천',
+    'Andong-si': '안동',
+    'Gumi-si': '구미',
+    'Changwon-si': '창원',
+    'Jinju-si': '진주',
+    'Tongyeong-si': '통영',
+    'Jeju-si': '제주',
+    'Seogwipo-si': '서귀포',
+    'Hwaseong': '화성',
+    'Yeoju': '여주',
+    'Yangpyeong': '양평',
+    'Goyang': '고양',
+    'Dongducheon': '동두천',
+    'Gapyeong': '가평',
+    'Yeoncheon': '연천',
+    'Yangju': '양주',
+    'Guri': '구리',
+    'Namyangju': '남양주',
+    'Pocheon': '포천',
+    'Siheung': '시흥',
+    'Gunpo': '군포',
+    'Uiwang': '의왕',
+    'Hanam': '하남',
+    'Gwangmyeong': '광명',
+    'Pyeongtaek': '평택',
+    'Gwacheon': '과천',
+    'Osan': '오산',
+    'Icheon': '이천',
+    'Anseong': '안성',
+    'Chuncheon': '춘천',
+    'Wonju': '원주',
+    'Gangneung': '강릉',
+    'Donghae': '동해',
+    'Taebaek': '태백',
+    'Sokcho': '속초',
+    'Samcheok': '삼척',
+    'Hongcheon': '홍천',
+    'Hoengseong': '횡성',
+    'Yeongwol': '영월',
+    'Pyeongchang': '평창',
+    'Jeongseon': '정선',
+    'Cheorwon': '철원',
+    'Hwacheon': '화천',
+    'Yanggu': '양구',
+    'Inje': '인제',
+    'Goseong': '고성',
+    'Yangyang': '양양',
+    'Cheongju': '청주',
+    'Chungju': '충주',
+    'Jecheon': '제천',
+    'Boeun': '보은',
+    'Okcheon': '옥천',
+    'Yeongdong': '영동',
+    'Jeungpyeong': '증평',
+    'Jincheon': '진천',
+    'Goesan': '괴산',
+    'Eumseong': '음성',
+    'Danyang': '단양',
+    'Cheonan': '천안',
+    'Gongju': '공주',
+    'Boryeong': '보령',
+    'Asan': '아산',
+    'Seosan': '서산',
+    'Nonsan': '논산',
+    'Gyeryong': '계룡',
+    'Dangjin': '당진',
+    'Geumsan': '금산',
+    'Buyeo': '부여',
+    'Seocheon': '서천',
+    'Cheongyang': '청양',
+    'Hongseong': '홍성',
+    'Yesan': '예산',
+    'Taean': '태안',
+    'Jeonju': '전주',
+    'Gunsan': '군산',
+    'Iksan': '익산',
+    'Jeongeup': '정읍',
+    'Namwon': '남원',
+    'Gimje': '김제',
+    'Wanju': '완주',
+    'Jinan': '진안',
+    'Muju': '무주',
+    'Jangsu': '장수',
+    'Imsil': '임실',
+    'Sunchang': '순창',
+    'Gochang': '고창',
+    'Buan': '부안',
+    'Mokpo': '목포',
+    'Yeosu': '여수',
+    'Suncheon': '순천',
+    'Naju': '나주',
+    'Gwangyang': '광양',
+    'Damyang': '담양',
+    'Gokseong': '곡성',
+    'Gurye': '구례',
+    'Goheung': '고흥',
+    'Boseong': '보성',
+    'Hwasun': '화순',
+    'Jangheung': '장흥',
+    'Gangjin': '강진',
+    'Haenam': '해남',
+    'Yeongam': '영암',
+    'Muan': '무안',
+    'Hampyeong': '함평',
+    'Yeonggwang': '영광',
+    'Jangseong': '장성',
+    'Wando': '완도',
+    'Jindo': '진도',
+    'Sinan': '신안',
+    'Pohang': '포항',
+    'Gyeongju': '경주',
+    'Gimcheon': '김천',
+    'Andong': '안동',
+    'Gumi': '구미',
+    'Yeongju': '영주',
+    'Yeongcheon': '영천',
+    'Sangju': '상주',
+    'Mungyeong': '문경',
+    'Gyeongsan': '경산',
+    'Gunwi': '군위',
+    'Uiseong': '의성',
+    'Cheongsong': '청송',
+    'Yeongyang': '영양',
+    'Yeongdeok': '영덕',
+    'Cheongdo': '청도',
+    'Goryeong': '고령',
+    'Seongju': '성주',
+    'Chilgok': '칠곡',
+    'Yecheon': '예천',
+    'Bonghwa': '봉화',
+    'Uljin': '울진',
+    'Ulleung': '울릉',
+    'Changwon': '창원',
+    'Jinju': '진주',
+    'Tongyeong': '통영',
+    'Sacheon': '사천',
+    'Gimhae': '김해',
+    'Miryang': '밀양',
+    'Geoje': '거제',
+    'Yangsan': '양산',
+    'Uiryeong': '의령',
+    'Haman': '함안',
+    'Changnyeong': '창녕',
+    'Goseong': '고성',
+    'Namhae': '남해',
+    'Hadong': '하동',
+    'Sancheong': '산청',
+    'Hamyang': '함양',
+    'Geochang': '거창',
+    'Hapcheon': '합천',
+    'Jeju': '제주',
+    'Seogwipo': '서귀포'
+}
+
+# 지역(도) -> 시/군/구 -> 구 -> 동/읍/면 계층 파일 (사이드바 지역 선택용)
+CITY_HIERARCHY_PATH = os.getenv("WEATHER_CITY_HIERARCHY_PATH", os.path.join(BASE_DIR, "data", "city_hierarchy.json"))
+
+def _dedupe_hierarchy(node):
+    """계층의 동/읍/면 목록에서 중복된 이름을 제거하는 함수 (순서 유지)"""
+    if isinstance(node, dict):
+        return {name: _dedupe_hierarchy(child) for name, child in node.items()}
+    return list(dict.fromkeys(node))
+
+def load_city_hierarchy(path=CITY_HIERARCHY_PATH):
+    """지역 계층 파일을 읽어 중복을 제거한 딕셔너리를 반환하는 함수 (파일이 없으면 빈 딕셔너리)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return _dedupe_hierarchy(json.load(f))
+    except (OSError, ValueError):
+        return {}
+
+# 계층에서 지역이 아닌 분류 키 (하위 목록의 종류)
+HIERARCHY_CATEGORY_KEYS = ("동", "읍", "면", "구", "시", "군")
+
+# 시/군/구 이름에서 KOREAN_CITIES 키로 바꿀 때 제거할 접미사 (긴 것부터)
+ADMIN_SUFFIXES = ("특별자치시", "특별자치도", "특별시", "광역시", "시", "군")
+
+# 지역 경로 키의 구분자 (예: '특별시/광역시>서울특별시>강남구>삼성동', 도시 ID 변환표의 키)
+LOCALITY_PATH_SEPARATOR = ">"
+
+# 지역 색인의 지역 하나 (id: 정수 지역 ID, level: 0=도 1=시/군/구 2=구 또는 동/읍/면 3=동/읍/면,
+# category: 계층의 분류 키, query: OpenWeather 검색어, alternatives: 대안 검색어)
+Locality = namedtuple('Locality', ['id', 'name', 'level', 'category', 'parent_id', 'child_ids', 'query', 'alternatives'])
+
+def strip_admin_suffix(name):
+    """'수원시', '서울특별시' 같은 행정구역명에서 접미사를 뗀 이름을 반환하는 함수"""
+    for suffix in ADMIN_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)]
+    return name
+
+def _english_variants(query):
+    """'Yangpyeong-gun,KR' 같은 검색어에서 응답 도시명으로 나올 수 있는 영문 이름들을 만드는 함수"""
+    name = query.split(',')[0]
+    yield name
+    for suffix in ('-si', '-gun', '-gu'):
+        if name.endswith(suffix):
+            yield name[:-len(suffix)]
+            return
+
+class LocalityIndex:
+    """모든 지역 정보(한글명, 검색어, 대안 검색어, 영문명, 상하위 관계)를 담은 읽기 전용 색인
+    
+    지역마다 정수 ID를 붙이고 이름은 intern하여 공유합니다. 같은 이름의 지역(예: 강남구/관악구의 삼성동,
+    강원도/경상남도의 고성군)은 서로 다른 ID를 가지며, 이름으로 찾으면 등록 순서대로 모두 반환합니다.
+    """
+    
+    def __init__(self, hierarchy, korean_cities, alternative_city_names, english_to_korean):
+        names = []
+        levels = []
+        categories = []
+        parent_ids = []
+        child_ids = []
+        queries = {}
+        alternatives = {}
+        by_parent = {}  # (상위 ID, 이름) -> ID (같은 상위 지역 아래 중복 제거)
+        by_name = {}
+        
+        def add(name, level, category, parent_id):
+            key = (parent_id, name)
+            if key in by_parent:
+                return by_parent[key]
+            locality_id = len(names)
+            name = sys.intern(name)
+            names.append(name)
+            levels.append(level)
+            categories.append(category)
+            parent_ids.append(parent_id)
+            child_ids.append([])
+            if parent_id is not None:
+                child_ids[parent_id].append(locality_id)
+            by_parent[key] = locality_id
+            by_name.setdefault(name, []).append(locality_id)
+            return locality_id
+        
+        def walk(node, parent_id, level, category=None):
+            if isinstance(node, dict):
+                for name, child in node.items():
+                    if name in HIERARCHY_CATEGORY_KEYS:
+                        walk(child, parent_id, level, name)
+                    else:
+                        walk(child, add(name, level, category, parent_id), level + 1)
+            elif isinstance(node, list):
+                for name in node:
+                    add(name, level, category, parent_id)
+        
+        # 1. 지역 계층
+        root_ids = []
+        for region, cities in hierarchy.items():
+            region_id = add(region, 0, None, None)
+            root_ids.append(region_id)
+            walk(cities, region_id, 1)
+        
+        # 2. KOREAN_CITIES의 검색어를 계층의 시/군/구에 연결 ('수원' -> 수원시)
+        cities_by_short_name = {}
+        for locality_id, level in enumerate(levels):
+            if level == 1:
+                cities_by_short_name.setdefault(strip_admin_suffix(names[locality_id]), []).append(locality_id)
+        for short_name, query in korean_cities.items():
+            matched = cities_by_short_name.get(short_name) or by_name.get(short_name)
+            if not matched:
+                # 계층에 없는 도시는 상위 지역 없이 추가
+                matched = [add(short_name, 1, None, None)]
+            for locality_id in matched:
+                queries.setdefault(locality_id, sys.intern(query))
+                if short_name in alternative_city_names:
+                    alternatives.setdefault(locality_id, tuple(sys.intern(alt) for alt in alternative_city_names[short_name]))
+            # 짧은 이름도 같은 지역을 가리키는 별칭으로 등록
+            aliases = by_name.setdefault(sys.intern(short_name), [])
+            aliases.extend(locality_id for locality_id in matched if locality_id not in aliases)
+        
+        self._localities = tuple(
+            Locality(locality_id, names[locality_id], levels[locality_id], categories[locality_id],
+                     parent_ids[locality_id], tuple(child_ids[locality_id]),
+                     queries.get(locality_id), alternatives.get(locality_id, ()))
+            for locality_id in range(len(names))
+        )
+        self._roots = tuple(self._localities[locality_id] for locality_id in root_ids)
+        self._by_name = {name: tuple(ids) for name, ids in by_name.items()}
+        self._by_path = {self.path_key(locality.id): locality for locality in self._localities}
+        
+        # 사이드바 선택 목록용 하위 지역 이름 튜플과 {이름: 지역} (None은 최상위)
+        self._child_names = {None: tuple(locality.name for locality in self._roots)}
+        self._child_by_name = {None: {locality.name: locality for locality in self._roots}}
+        for locality in self._localities:
+            if locality.child_ids:
+                children = [self._localities[i] for i in locality.child_ids]
+                self._child_names[locality.id] = tuple(child.name for child in children)
+                self._child_by_name[locality.id] = {child.name: child for child in children}
+        
+        # 이름 -> 검색어/대안 검색어 (같은 이름이 여러 개면 검색어가 있는 첫 지역 기준, 없으면 이름 그대로)
+        self._queries = {}
+        self._alternatives = {}
+        for name, ids in self._by_name.items():
+            resolved = next((self._localities[i] for i in ids if self._localities[i].query), None)
+            self._queries[name] = resolved.query if resolved else name
+            self._alternatives[name] = resolved.alternatives if resolved else ()
+        
+        # 영문명 -> 한글명 (직접 매핑 우선, 이후 검색어/대안 검색어와 -si/-gun 변형)
+        self._korean_names = {sys.intern(english): sys.intern(korean) for english, korean in english_to_korean.items()}
+        for short_name, query in korean_cities.items():
+            for candidate in [query] + list(alternative_city_names.get(short_name, [])):
+                for english in _english_variants(candidate):
+                    self._korean_names.setdefault(sys.intern(english), sys.intern(short_name))
+    
+    def __len__(self):
+        return len(self._localities)
+    
+    def names(self):
+        """색인에 있는 모든 이름(별칭 포함) 반환"""
+        return self._by_name.keys()
+    
+    def get(self, locality_id):
+        """지역 ID로 지역 반환"""
+        return self._localities[locality_id]
+    
+    def find(self, name):
+        """이름(별칭 포함)이 같은 모든 지역을 튜플로 반환 (없으면 빈 튜플)"""
+        return tuple(self._localities[i] for i in self._by_name.get(name, ()))
+    
+    def lookup(self, name, within=None):
+        """이름으로 지역 하나를 반환 (within을 지정하면 그 이름의 상위 지역 아래에서 찾음, 없으면 None)"""
+        for locality_id in self._by_name.get(name, ()):
+            if within is None or within in self.path_names(locality_id):
+                return self._localities[locality_id]
+        return None
+    
+    def query_for(self, name):
+        """지역명을 OpenWeather 검색어로 변환 (색인에 없으면 입력 그대로)"""
+        return self._queries.get(name, name)
+    
+    def alternatives_for(self, name):
+        """지역명의 대안 검색어 튜플 반환 (없으면 빈 튜플)"""
+        return self._alternatives.get(name, ())
+    
+    def has_alternatives(self, name):
+        """대안 검색어가 있는 지역인지 확인"""
+        return bool(self._alternatives.get(name))
+    
+    def korean_name(self, english_name):
+        """OpenWeather 응답의 영문 도시명을 한글명으로 변환 (모르면 입력 그대로)"""
+        return self._korean_names.get(english_name, english_name)
+    
+    def known_queries(self):
+        """검색어가 있는 지역들의 {영문 도시명: 검색어} 딕셔너리 반환 (예: "Seoul" -> "Seoul,KR")"""
+        return {locality.query.split(',')[0]: locality.query for locality in self._localities if locality.query}
+    
+    def roots(self):
+        """최상위 지역(도) 튜플 반환"""
+        return self._roots
+    
+    def children(self, locality_id):
+        """하위 지역 튜플 반환"""
+        return tuple(self._localities[i] for i in self._localities[locality_id].child_ids)
+    
+    def child_names(self, locality_id=None):
+        """하위 지역 이름 튜플 반환 (None이면 최상위 지역, 미리 만든 튜플을 그대로 반환)"""
+        return self._child_names.get(locality_id, ())
+    
+    def child(self, locality_id, name):
+        """이름으로 하위 지역 하나를 반환 (None이면 최상위 지역에서 찾음, 없으면 None)"""
+        return self._child_by_name.get(locality_id, {}).get(name)
+    
+    def parent(self, locality_id):
+        """상위 지역 반환 (최상위면 None)"""
+        parent_id = self._localities[locality_id].parent_id
+        return None if parent_id is None else self._localities[parent_id]
+    
+    def descendants(self, locality_id):
+        """모든 하위 지역을 위에서부터 차례로 내보내는 생성기"""
+        stack = list(reversed(self._localities[locality_id].child_ids))
+        while stack:
+            locality = self._localities[stack.pop()]
+            yield locality
+            stack.extend(reversed(locality.child_ids))
+    
+    def path_names(self, locality_id):
+        """최상위 지역부터 해당 지역까지의 이름 목록 반환 (예: ['특별시/광역시', '서울특별시', '강남구', '삼성동'])"""
+        path = []
+        while locality_id is not None:
+            locality = self._localities[locality_id]
+            path.append(locality.name)
+            locality_id = locality.parent_id
+        return path[::-1]
+    
+    def path_key(self, locality_id):
+        """같은 이름의 지역도 구분되는 경로 문자열 반환 (예: '특별시/광역시>서울특별시>강남구>삼성동')"""
+        return LOCALITY_PATH_SEPARATOR.join(self.path_names(locality_id))
+    
+    def by_path(self, path_key):
+        """경로 문자열로 지역 반환 (없으면 None)"""
+        return self._by_path.get(path_key)
+
+@shared_resource
+def get_locality_index():
+    """프로세스 전체에서 공유하는 지역 색인을 반환하는 함수 (처음 한 번만 생성)"""
+    return LocalityIndex(load_city_hierarchy(), KOREAN_CITIES, ALTERNATIVE_CITY_NAMES, ENGLISH_TO_KOREAN)
+
+# 한글 자모 분해 표 (초성 검색과 입력 중인 글자 일치에 사용)
+HANGUL_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+HANGUL_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+HANGUL_JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"  # 첫 칸은 받침 없음
+# 겹받침/이중 모음은 키보드로 입력하는 순서대로 나눔 (예: '닭'을 입력하는 중의 '달' + 'ㄱ')
+HANGUL_COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ', 'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ',
+    'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ'
+}
+_CHOSEONG_SET = frozenset(HANGUL_CHOSEONG)
+
+def decompose_jamo(text):
+    """한글을 자모 문자열로 분해하는 함수 (예: '역삼' -> 'ㅇㅕㄱㅅㅏㅁ', 공백 제거, 영문은 소문자)"""
+    jamo = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            jamo.append(HANGUL_CHOSEONG[code // 588])
+            jamo.append(HANGUL_COMPOUND_JAMO.get(HANGUL_JUNGSEONG[code % 588 // 28], HANGUL_JUNGSEONG[code % 588 // 28]))
+            if code % 28:
+                jamo.append(HANGUL_COMPOUND_JAMO.get(HANGUL_JONGSEONG[code % 28], HANGUL_JONGSEONG[code % 28]))
+        elif not char.isspace():
+            jamo.append(HANGUL_COMPOUND_JAMO.get(char, char.lower()))
+    return ''.join(jamo)
+
+def extract_choseong(text):
+    """한글의 초성만 뽑아내는 함수 (예: '역삼동' -> 'ㅇㅅㄷ')"""
+    return ''.join(
+        HANGUL_CHOSEONG[(ord(char) - 0xAC00) // 588] if 0 <= ord(char) - 0xAC00 < 11172 else char
+        for char in text if not char.isspace()
+    )
+
+def edit_distance(a, b, limit):
+    """두 문자열의 편집 거리를 계산하는 함수 (limit을 넘으면 limit + 1 반환)"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+# 자동 완성 설정
+AUTOCOMPLETE_LIMIT = 8  # 추천 지역 최대 개수
+FUZZY_MAX_DISTANCE = 2  # 오타 허용 최대 편집 거리 (자모 기준)
+
+class LocalitySearch:
+    """지역 색인의 모든 이름(별칭 포함)을 자모/초성 접두사와 오타 허용으로 찾는 자동 완성 색인
+    
+    자모/초성 문자열을 정렬한 배열에서 이진 탐색으로 접두사 범위를 찾고, 일치하는 지역이 없으면
+    삭제 이웃(자모를 1~2개 지운 문자열) 사전으로 편집 거리가 가까운 이름을 찾습니다.
+    """
+    
+    def __init__(self, locality_index):
+        self.locality_index = locality_index
+        jamo_entries = []
+        choseong_entries = []
+        self._ranks = {}
+        self._by_jamo = {}
+        for name in locality_index.names():
+            jamo = decompose_jamo(name)
+            choseong = extract_choseong(name)
+            for locality in locality_index.find(name):
+                parent = locality_index.parent(locality.id)
+                if parent is not None and parent.name == locality.name:
+                    # '광명시 > 광명시'처럼 상위 지역과 이름이 같은 항목은 추천하지 않음
+                    continue
+                # 검색어가 있는 도시, 상위 단계, 짧은 이름 순으로 추천
+                rank = (locality.query is None, locality.level, len(locality.name), locality.id)
+                self._ranks[locality.id] = min(rank, self._ranks.get(locality.id, rank))
+                jamo_entries.append((jamo, locality.id))
+                choseong_entries.append((choseong, locality.id))
+                self._by_jamo.setdefault(jamo, []).append(locality.id)
+        jamo_entries.sort()
+        choseong_entries.sort()
+        self._jamo_keys = [key for key, _ in jamo_entries]
+        self._jamo_ids = [locality_id for _, locality_id in jamo_entries]
+        self._choseong_keys = [key for key, _ in choseong_entries]
+        self._choseong_ids = [locality_id for _, locality_id in choseong_entries]
+        
+        # 오타 허용 검색용 삭제 이웃 사전 (처음 필요할 때 생성)
+        self._deletes = None
+        self._deletes_lock = threading.Lock()
+    
+    @staticmethod
+    def _deletions(jamo, depth):
+        """자모를 depth개까지 지운 모든 문자열 집합 반환 (원래 문자열 포함)"""
+        variants = {jamo}
+        frontier = {jamo}
+        for _ in range(depth):
+            frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+            variants |= frontier
+        return variants
+    
+    def _fuzzy(self, jamo, limit):
+        """편집 거리가 limit 이하인 (거리, 자모 문자열) 목록 반환"""
+        if self._deletes is None:
+            with self._deletes_lock:
+                if self._deletes is None:
+                    deletes = {}
+                    for key in self._by_jamo:
+                        for variant in self._deletions(key, FUZZY_MAX_DISTANCE):
+                            deletes.setdefault(variant, []).append(key)
+                    self._deletes = deletes
+        
+        candidates = set()
+        for variant in self._deletions(jamo, limit):
+            candidates.update(self._deletes.get(variant, ()))
+        found = []
+        for key in candidates:
+            distance = edit_distance(jamo, key, limit)
+            if distance <= limit:
+                found.append((distance, key))
+        return found
+    
+    @staticmethod
+    def _prefix_range(keys, prefix):
+        """정렬된 배열에서 prefix로 시작하는 범위 (시작, 끝) 반환"""
+        start = bisect.bisect_left(keys, prefix)
+        return start, bisect.bisect_left(keys, prefix + '￿', start)
+    
+    def search(self, query, limit=AUTOCOMPLETE_LIMIT):
+        """입력 중인 검색어에 맞는 지역(Locality)을 순위대로 최대 limit개 반환"""
+        query = query.strip()
+        if not query:
+            return []
+        
+        matches = {}  # 지역 ID -> 순위 (일치 종류, 지역 순위)
+        jamo = decompose_jamo(query)
+        for locality_id in self._by_jamo.get(jamo, ()):
+            matches[locality_id] = (0, self._ranks[locality_id])
+        
+        # 자모 접두사 ('역ㅅ', '역사' -> 역삼동)
+        start, end = self._prefix_range(self._jamo_keys, jamo)
+        candidates = heapq.nsmallest(limit * 2, self._jamo_ids[start:end], key=self._ranks.__getitem__)
+        for locality_id in candidates:
+            matches.setdefault(locality_id, (1, self._ranks[locality_id]))
+        
+        # 초성 접두사 ('ㅇㅅ' -> 역삼동)
+        if all(char in _CHOSEONG_SET for char in query.replace(' ', '')):
+            start, end = self._prefix_range(self._choseong_keys, query.replace(' ', ''))
+            candidates = heapq.nsmallest(limit * 2, self._choseong_ids[start:end], key=self._ranks.__getitem__)
+            for locality_id in candidates:
+                matches.setdefault(locality_id, (2, self._ranks[locality_id]))
+        
+        # 일치하는 지역이 없으면 오타 허용 (자모 기준 편집 거리 1~2)
+        if not matches and len(jamo) >= 3:
+            for distance, key in self._fuzzy(jamo, 1 if len(jamo) <= 6 else FUZZY_MAX_DISTANCE):
+                for locality_id in self._by_jamo[key]:
+                    matches.setdefault(locality_id, (3 + distance, self._ranks[locality_id]))
+        
+        ranked = heapq.nsmallest(limit, matches.items(), key=lambda item: item[1])
+        return [self.locality_index.get(locality_id) for locality_id, _ in ranked]
+    
+    def label(self, locality):
+        """추천 목록에 표시할 이름 (같은 이름이 여러 곳이면 상위 지역을 함께 표시)"""
+        namesakes = [other for other in self.locality_index.find(locality.name) if other.id in self._ranks]
+        if len(namesakes) <= 1:
+            return locality.name
+        path = self.locality_index.path_names(locality.id)
+        return f"{locality.name} ({' '.join(path[1:-1] or path[:-1])})"
+
+@shared_resource
+def get_locality_search():
+    """프로세스 전체에서 공유하는 지역 자동 완성 색인을 반환하는 함수 (처음 한 번만 생성)"""
+    return LocalitySearch(get_locality_index())
+
+EARTH_RADIUS_KM = 6371.0
+NEARBY_RADIUS_KM = float(os.getenv("WEATHER_NEARBY_RADIUS_KM", "5"))  # 좌표 검색 시 함께 보여줄 주변 지역 반경
+
+def to_unit_vector(lat, lon):
+    """위도/경도를 지구 중심 단위 벡터 (x, y, z)로 변환하는 함수 (직선 거리가 대원 거리와 같은 순서)"""
+    lat, lon = math.radians(lat), math.radians(lon)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+def chord_to_km(chord):
+    """단위 구의 직선 거리를 대원 거리(km)로 변환하는 함수"""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+def km_to_chord(distance_km):
+    """대원 거리(km)를 단위 구의 직선 거리로 변환하는 함수"""
+    return 2 * math.sin(min(distance_km / EARTH_RADIUS_KM, math.pi) / 2)
+
+class LocalityTree:
+    """좌표를 아는 지역으로 만든 읽기 전용 KD 트리 (가장 가까운 지역, 반경 검색)
+    
+    좌표는 지구 중심 단위 벡터(3차원)로 저장하여 경도 경계나 위도에 따른 왜곡 없이 거리를 비교합니다.
+    트리는 배열 하나에 담기며, 구간 [lo, hi)의 가운데 원소가 그 구간의 분할 노드입니다.
+    """
+    
+    def __init__(self, points):
+        # points: (Locality, 위도, 경도) 목록
+        entries = [(to_unit_vector(lat, lon), locality) for locality, lat, lon in points]
+        self._axes = [0] * len(entries)
+        self._build(entries, 0, len(entries))
+        self._vectors = [entry[0] for entry in entries]
+        self._localities = [entry[1] for entry in entries]
+    
+    def __len__(self):
+        return len(self._localities)
+    
+    def _build(self, entries, lo, hi):
+        """구간 [lo, hi)를 값이 가장 넓게 퍼진 축의 중앙값으로 나누어 제자리에서 정렬하는 함수"""
+        stack = [(lo, hi)]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= 1:
+                continue
+            spans = [max(entry[0][axis] for entry in entries[lo:hi]) - min(entry[0][axis] for entry in entries[lo:hi]) for axis in range(3)]
+            axis = spans.index(max(spans))
+            entries[lo:hi] = sorted(entries[lo:hi], key=lambda entry: entry[0][axis])
+            middle = (lo + hi) // 2
+            self._axes[middle] = axis
+            stack.append((lo, middle))
+            stack.append((middle + 1, hi))
+    
+    def nearest(self, lat, lon, k=1):
+        """좌표에서 가까운 순서로 최대 k개의 (지역, 거리 km) 목록 반환"""
+        if not self._localities:
+            return []
+        target = to_unit_vector(lat, lon)
+        vectors = self._vectors
+        axes = self._axes
+        best = []  # (-제곱 거리, 위치) 최대 힙
+        bound = float('inf')  # k개를 찾은 뒤 그중 가장 먼 제곱 거리
+        stack = [(0, len(vectors), 0.0)]  # (구간 시작, 끝, 분할면까지의 제곱 거리)
+        while stack:
+            lo, hi, plane_distance = stack.pop()
+            if plane_distance >= bound:
+                # 넣은 뒤 더 가까운 점을 찾아 이제는 볼 필요가 없는 구간
+                continue
+            middle = (lo + hi) // 2
+            vector = vectors[middle]
+            dx = target[0] - vector[0]
+            dy = target[1] - vector[1]
+            dz = target[2] - vector[2]
+            distance = dx * dx + dy * dy + dz * dz
+            if distance < bound:
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, middle))
+                else:
+                    heapq.heapreplace(best, (-distance, middle))
+                if len(best) == k:
+                    bound = -best[0][0]
+            
+            axis = axes[middle]
+            diff = target[axis] - vector[axis]
+            if diff < 0:
+                near_lo, near_hi, far_lo, far_hi = lo, middle, middle + 1, hi
+            else:
+                near_lo, near_hi, far_lo, far_hi = middle + 1, hi, lo, middle
+            # 분할면 너머에 더 가까운 점이 있을 수 있을 때만 반대쪽도 탐색 (가까운 쪽을 먼저 꺼내도록 나중에 넣음)
+            if far_lo < far_hi and diff * diff < bound:
+                stack.append((far_lo, far_hi, diff * diff))
+            if near_lo < near_hi:
+                stack.append((near_lo, near_hi, plane_distance))
+        return [(self._localities[index], chord_to_km(math.sqrt(-distance)))
+                for distance, index in sorted(best, reverse=True)]
+    
+    def within(self, lat, lon, radius_km):
+        """좌표에서 radius_km 안에 있는 모든 (지역, 거리 km) 목록을 가까운 순서로 반환"""
+        target = to_unit_vector(lat, lon)
+        limit = km_to_chord(radius_km) ** 2
+        vectors = self._vectors
+        axes = self._axes
+        found = []
+        stack = [(0, len(vectors))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            middle = (lo + hi) // 2
+            vector = vectors[middle]
+            dx = target[0] - vector[0]
+            dy = target[1] - vector[1]
+            dz = target[2] - vector[2]
+            distance = dx * dx + dy * dy + dz * dz
+            if distance <= limit:
+                found.append((distance, middle))
+            
+            diff = target[axes[middle]] - vector[axes[middle]]
+            if diff <= 0 or diff * diff <= limit:
+                stack.append((lo, middle))
+            if diff >= 0 or diff * diff <= limit:
+                stack.append((middle + 1, hi))
+        found.sort()
+        return [(self._localities[index], chord_to_km(math.sqrt(distance))) for distance, index in found]
+
+@shared_resource
+def get_locality_tree():
+    """도시 ID 변환표의 좌표로 만든 지역 KD 트리를 반환하는 함수 (처음 한 번만 생성, 변환표가 없으면 빈 트리)
+    
+    상위 지역 좌표를 물려받은 항목은 그 지역의 위치가 아니므로 넣지 않습니다.
+    """
+    locality_index = get_locality_index()
+    return LocalityTree([
+        (locality_index.get(locality_id), city_entry.lat, city_entry.lon)
+        for locality_id, city_entry in get_city_table().items()
+        if not city_entry.inherited
+    ])
+
+class WeatherAPIError(Exception):
+    """OpenWeather API가 정상 응답을 주지 않았을 때 발생하는 예외"""
+    
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def fetch_weather_data(city_input, refresh=False, priority=PRIORITY_INTERACTIVE, locality_id=None):
+    """지역명의 날씨 데이터를 캐시 또는 API에서 가져오는 함수 (화면 출력 없음)
+    
+    동/읍/면은 조회 가능한 가장 가까운 상위 지역의 날씨를 가져옵니다 (resolve_locality 참고).
+    locality_id를 지정하면 같은 이름의 여러 지역 중 그 지역을 기준으로 합니다.
+    좌표 기반 캐시(GEOHASH_PRECISION)를 사용하면 같은 칸의 지역은 한 번 받은 값을 함께 쓰며,
+    요청 지점에서 관측 지점까지의 거리(distance_km)를 붙여 반환합니다.
+    refresh=True이면 캐시를 건너뛰고 API에서 새로 가져옵니다.
+    사용자 조회(PRIORITY_INTERACTIVE)는 앱과 API 서버 어디에서 오든 인기 지역 미리 갱신의 인기도에 반영합니다.
+    호출 한도를 넘으면 만료된 캐시라도 있으면 그 값을 반환합니다.
+    실패하면 WeatherAPIError 또는 requests 예외를 발생시킵니다.
+    """
+    # API 키 확인
+    if not API_KEY:
+        raise WeatherAPIError("API 키가 설정되지 않았습니다.")
+    
+    # 일괄 조회와 백그라운드 갱신은 인기도에 넣지 않음 (지역 전체 내보내기나 갱신 자체가 인기 지역이 되지 않도록)
+    if priority == PRIORITY_INTERACTIVE:
+        get_prefetcher().record(city_input, locality_id)
+    
+    # 지역명을 검색 조건과 캐시 키로 변환 (geohash 칸 또는 동/읍/면의 상위 지역 기준)
+    city_input, location_params, cache_key, coordinates = resolve_weather_request(city_input, locality_id)
+    weather_data = _fetch_weather(city_input, location_params, cache_key, refresh, priority, locality_id)
+    if coordinates is not None:
+        return weather_data.with_distance(*coordinates)
+    return weather_data
+
+def _fetch_weather(city_input, location_params, cache_key, refresh, priority, locality_id=None):
+    """캐시, stale-while-revalidate, 동시 요청 합치기, 장애 시 대체 값을 거쳐 날씨 데이터를 가져오는 함수"""
+    # 캐시 확인 (변환된 검색 조건, 단위, 언어 기준)
+    weather_cache = get_weather_cache()
+    if not refresh:
+        cached_data = weather_cache.get(cache_key)
+        if cached_data is not None:
+            return cached_data
+        
+        # 만료된 지 얼마 안 된 값은 바로 반환하고 백그라운드에서 갱신 (stale-while-revalidate)
+        stale_data, age = weather_cache.peek(cache_key)
+        if stale_data is not None and age <= weather_cache.ttl + STALE_WHILE_REVALIDATE:
+            get_prefetcher().schedule_refresh(city_input, locality_id, cache_key)
+            return stale_data
+    
+    # 같은 검색 조건의 동시 요청은 하나의 API 요청으로 합침
+    try:
+        return get_single_flight().do(
+            cache_key, lambda: _fetch_upstream(city_input, location_params, cache_key, refresh, priority)
+        )
+    except RateLimitExceeded as e:
+        # 호출 한도 초과 시 마지막으로 받은 데이터라도 경과 시간과 함께 반환 (load shedding)
+        last_known = get_last_known_weather(weather_cache, cache_key)
+        if last_known is None:
+            raise WeatherAPIError(str(e), 429) from e
+        return last_known
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError, WeatherAPIError) as e:
+        # API 시간 초과/연결 실패/5xx 오류 시 마지막으로 받은 데이터를 경과 시간과 함께 반환 (stale-if-error)
+        if isinstance(e, WeatherAPIError) and (e.status_code is None or e.status_code < 500):
+            raise
+        last_known = get_last_known_weather(weather_cache, cache_key)
+        if last_known is None:
+            raise
+        return last_known
+
+def get_last_known_weather(weather_cache, cache_key):
+    """메모리 또는 디스크 캐시에서 마지막으로 받은 데이터를 찾아 경과 시간(stale_age, 초)을 붙여 반환하는 함수"""
+    weather_data, age = weather_cache.peek(cache_key)
+    if weather_data is None and weather_cache.store is not None:
+        try:
+            weather_data, stored_at = weather_cache.store.get(cache_key)
+        except (sqlite3.Error, ValueError, TypeError):
+            weather_data = None
+        if weather_data is not None:
+            age = time.time() - stored_at
+    if weather_data is None:
+        return None
+    # 공유 캐시 값은 그대로 두고 사본에 경과 시간 표시
+    return weather_data.with_stale_age(age)
+
+def _fetch_upstream(city_input, location_params, cache_key, refresh, priority):
+    """API에서 날씨 데이터를 가져와 캐시에 저장하는 함수"""
+    weather_cache = get_weather_cache()
+    
+    # 앞선 요청이 방금 캐시를 채웠으면 그 값을 사용
+    if not refresh:
+        cached_data, age = weather_cache.peek(cache_key)
+        if cached_data is not None and age <= weather_cache.ttl:
+            return cached_data
+    
+    # 변환표에 없고 대안 이름이 있는 도시의 경우 여러 가지 이름을 동시에 시도
+    locality_index = get_locality_index()
+    if 'q' in location_params and locality_index.has_alternatives(city_input):
+        weather_data = fetch_alternative_weather(city_input, locality_index.alternatives_for(city_input), priority)
+        if weather_data:
+            weather_cache.set(cache_key, weather_data)
+            return weather_data
+    
+    # API 요청 파라미터
+    params = {
+        **location_params,
+        'appid': API_KEY,
+        'units': 'metric',  # 섭씨 온도
+        'lang': 'kr'  # 한국어
+    }
+    
+    # API 요청
+    response = api_get(BASE_URL, params, 10, priority)
+    
+    if response.status_code != 200:
+        raise WeatherAPIError(f"API 요청 오류: {response.status_code}", response.status_code)
+    
+    weather_data = WeatherSnapshot.from_api(decode_json(response.content))
+    weather_cache.set(cache_key, weather_data)
+    return weather_data
+
+# 인기 지역 미리 갱신 설정
+PREFETCH_TOP_N = int(os.getenv("WEATHER_PREFETCH_TOP_N", "20"))
+PREFETCH_INTERVAL = 30  # 인기 지역 만료 확인 주기 (초)
+PREFETCH_LEAD_TIME = 60  # 만료 몇 초 전부터 미리 갱신할지
+POPULARITY_HALF_LIFE = 3600  # 인기도 점수가 절반으로 줄어드는 시간 (초)
+POPULARITY_MIN_SCORE = 0.05  # 이보다 낮아진 점수는 인기도 목록에서 삭제 (1회 검색 후 약 4.3 반감기)
+POPULARITY_MAX_ENTRIES = int(os.getenv("WEATHER_POPULARITY_MAX_ENTRIES", "1000"))  # 인기도를 추적할 최대 지역 수
+STALE_WHILE_REVALIDATE = int(os.getenv("WEATHER_STALE_WHILE_REVALIDATE", "600"))
+
+class WeatherPrefetcher:
+    """검색 인기도를 추적하여 인기 지역의 캐시를 만료 전에 백그라운드에서 갱신하는 클래스"""
+    
+    def __init__(self, cache, top_n, interval, lead_time, half_life,
+                 min_score=POPULARITY_MIN_SCORE, max_entries=POPULARITY_MAX_ENTRIES):
+        self.cache = cache
+        self.top_n = top_n
+        self.interval = interval
+        self.lead_time = lead_time
+        self.half_life = half_life
+        self.min_score = min_score
+        self.max_entries = max_entries
+        self._scores = {}  # (지역명, 지역 ID) -> (점수, 마지막 갱신 시각)
+        self._pending = set()  # 갱신 대기/진행 중인 캐시 키
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="weather-prefetcher", daemon=True)
+        self._thread.start()
+    
+    def _decayed(self, score, updated_at, now):
+        """시간이 지난 만큼 감소한 인기도 점수 계산"""
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+    
+    def record(self, city_input, locality_id=None):
+        """검색 1회를 인기도 점수에 반영 (같은 이름의 지역은 지역 ID로 구분)"""
+        now = time.time()
+        request = (city_input, locality_id)
+        with self._lock:
+            score, updated_at = self._scores.get(request, (0.0, now))
+            self._scores[request] = (self._decayed(score, updated_at, now) + 1.0, now)
+            if len(self._scores) > self.max_entries:
+                self._prune(now)
+    
+    def _prune(self, now):
+        """점수가 충분히 줄어든 지역을 지우고, 그래도 많으면 점수가 낮은 지역부터 삭제 (잠금을 잡은 상태에서 호출)"""
+        decayed = {
+            request: self._decayed(score, updated_at, now)
+            for request, (score, updated_at) in self._scores.items()
+        }
+        for request, score in decayed.items():
+            if score < self.min_score:
+                del self._scores[request]
+        excess = len(self._scores) - self.max_entries
+        if excess > 0:
+            for request in heapq.nsmallest(excess, self._scores, key=decayed.__getitem__):
+                del self._scores[request]
+    
+    def top(self, n):
+        """현재 인기도 상위 n개 (지역명, 지역 ID) 반환"""
+        now = time.time()
+        with self._lock:
+            ranked = sorted(
+                self._scores.items(),
+                key=lambda item: self._decayed(item[1][0], item[1][1], now),
+                reverse=True
+            )
+        return [request for request, _ in ranked[:n]]
+    
+    def schedule_refresh(self, city_input, locality_id=None, cache_key=None):
+        """지역 갱신을 예약 (같은 캐시 키가 이미 예약되어 있으면 무시)"""
+        if cache_key is None:
+            cache_key = resolve_weather_request(city_input, locality_id)[2]
+        with self._lock:
+            if cache_key in self._pending:
+                return
+            self._pending.add(cache_key)
+        self._queue.put((city_input, locality_id, cache_key))
+    
+    def _refresh(self, city_input, locality_id, cache_key):
+        """지역 하나를 API에서 새로 가져와 캐시에 저장"""
+        try:
+            fetch_weather_data(city_input, refresh=True, priority=PRIORITY_BACKGROUND, locality_id=locality_id)
+        except (WeatherAPIError, requests.exceptions.RequestException, ValueError):
+            # 갱신 실패 시 기존 캐시를 유지
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(cache_key)
+    
+    def _schedule_expiring(self):
+        """인기 지역 중 곧 만료되는 캐시 항목의 갱신을 예약"""
+        with self._lock:
+            self._prune(time.time())
+        for city_input, locality_id in self.top(self.top_n):
+            # 조회할 때와 같은 규칙으로 캐시 키를 만듦 (geohash 칸, 같은 이름의 다른 지역 구분)
+            cache_key = resolve_weather_request(city_input, locality_id)[2]
+            _, age = self.cache.peek(cache_key)
+            if age is not None and age >= self.cache.ttl - self.lead_time:
+                self.schedule_refresh(city_input, locality_id, cache_key)
+    
+    def _run(self):
+        """백그라운드 작업 루프"""
+        last_scan = 0.0
+        while True:
+            try:
+                self._refresh(*self._queue.get(timeout=self.interval))
+            except queue.Empty:
+                pass
+            if time.time() - last_scan >= self.interval:
+                last_scan = time.time()
+                self._schedule_expiring()
+
+@shared_resource
+def get_prefetcher():
+    """프로세스 전체에서 공유하는 인기 지역 미리 갱신 작업자를 반환하는 함수"""
+    return WeatherPrefetcher(
+        get_weather_cache(), PREFETCH_TOP_N, PREFETCH_INTERVAL, PREFETCH_LEAD_TIME, POPULARITY_HALF_LIFE
+    )
+
+def get_weather_batch(localities):
+    """여러 지역의 날씨를 group API로 묶어서 가져오는 함수
+    
+    지역명은 단일 조회(fetch_weather_data)와 같은 규칙으로 변환하므로 동/읍/면은 상위 지역의 도시 ID로,
+    같은 캐시 키를 공유합니다. 도시 ID로 조회할 수 없는 지역은 오류로 돌려주므로 따로 조회하세요.
+    ({지역명: 날씨 데이터}, {지역명: 오류 메시지}) 튜플을 반환합니다.
+    """
+    results = {}
+    errors = {}
+    if not API_KEY:
+        return results, {locality: "API 키가 설정되지 않았습니다." for locality in localities}
+    
+    weather_cache = get_weather_cache()
+    
+    # 캐시에 있는 지역은 바로 사용하고, 나머지는 도시 ID별로 모으기
+    pending = {}  # 도시 ID -> [지역명, ...]
+    cache_keys = {}  # 지역명 -> 캐시 키
+    for locality in dict.fromkeys(localities):
+        _, location_params, cache_key, _ = resolve_weather_request(locality)
+        if 'id' not in location_params:
+            errors[locality] = "도시 ID를 찾을 수 없습니다."
+            continue
+        cached_data = weather_cache.get(cache_key)
+        if cached_data is not None:
+            results[locality] = cached_data
+        else:
+            cache_keys[locality] = cache_key
+            pending.setdefault(location_params['id'], []).append(locality)
+    
+    # 최대 GROUP_BATCH_SIZE개씩 나누어 요청
+    city_ids = list(pending)
+    for start in range(0, len(city_ids), GROUP_BATCH_SIZE):
+        chunk = city_ids[start:start + GROUP_BATCH_SIZE]
+        chunk_localities = [locality for city_id in chunk for locality in pending[city_id]]
+        params = {
+            'id': ','.join(str(city_id) for city_id in chunk),
+            'appid': API_KEY,
+            'units': 'metric',
+            'lang': 'kr'
+        }
+        try:
+            response = api_get(GROUP_URL, params, 10, PRIORITY_BATCH)
+            if response.status_code != 200:
+                for locality in chunk_localities:
+                    errors[locality] = f"API 요청 오류: {response.status_code}"
+                continue
+            returned = {
+                item.get('id'): WeatherSnapshot.from_api(item)
+                for item in decode_json(response.content).get('list', [])
+            }
+        except RateLimitExceeded as e:
+            # 호출 한도 초과 시 단일 조회와 같이 마지막으로 받은 데이터라도 경과 시간과 함께 사용
+            for locality in chunk_localities:
+                last_known = get_last_known_weather(weather_cache, cache_keys[locality])
+                if last_known is not None:
+                    results[locality] = last_known
+                else:
+                    errors[locality] = str(e)
+            continue
+        except requests.exceptions.RequestException as e:
+            for locality in chunk_localities:
+                errors[locality] = f"네트워크 오류: {e}"
+            continue
+        except ValueError as e:
+            for locality in chunk_localities:
+                errors[locality] = f"JSON 파싱 오류: {e}"
+            continue
+        
+        for city_id in chunk:
+            weather_data = returned.get(city_id)
+            for locality in pending[city_id]:
+                if weather_data is None:
+                    errors[locality] = "응답에 해당 도시가 없습니다."
+                else:
+                    results[locality] = weather_data
+                    weather_cache.set(cache_keys[locality], weather_data)
+    
+    return results, errors
+
+# 비동기 일괄 조회 설정
+FETCH_CONCURRENCY = int(os.getenv("WEATHER_FETCH_CONCURRENCY", "8"))
+# 지역당 제한 시간 (초): 일괄 조회 우선순위의 호출 한도 최대 대기 시간 + API 요청 시간
+FETCH_TIMEOUT = RATE_LIMIT_MAX_WAIT[PRIORITY_BATCH] + 10
+
+def _fetch_before_deadline(locality, deadline):
+    """마감 시각이 지나면 호출 한도를 기다리지 않도록 하고 지역 하나를 일괄 조회 우선순위로 가져오는 함수 (작업 스레드에서 실행)"""
+    _request_deadline.set(deadline)
+    return fetch_weather_data(locality, False, PRIORITY_BATCH)
+
+async def fetch_weather_stream(localities, concurrency=FETCH_CONCURRENCY, timeout=FETCH_TIMEOUT):
+    """여러 지역의 날씨를 가져와 완료되는 순서대로 (지역명, 데이터, 오류 메시지)를 내보내는 비동기 생성기
+    
+    도시 ID가 있는 지역은 group API로 먼저 묶어서 가져오고, 나머지는 지역별로 동시에 조회합니다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_one(locality):
+        async with semaphore:
+            try:
+                # 공유 HTTP 세션과 캐시를 그대로 쓰도록 동기 조회 함수를 스레드에서 실행
+                # 시간이 초과되어 결과를 버린 작업은 마감 이후 새 API 요청을 보내지 않음
+                weather_data = await asyncio.wait_for(
+                    asyncio.to_thread(_fetch_before_deadline, locality, time.monotonic() + timeout), timeout
+                )
+                return locality, weather_data, None
+            except asyncio.TimeoutError:
+                return locality, None, "요청 시간이 초과되었습니다."
+            except WeatherAPIError as e:
+                return locality, None, str(e)
+            except requests.exceptions.RequestException as e:
+                return locality, None, f"네트워크 오류: {e}"
+            except ValueError as e:
+                return locality, None, f"JSON 파싱 오류: {e}"
+    
+    localities = list(dict.fromkeys(localities))
+    # 도시 ID 변환표가 있으면 ID로 조회할 수 있는 지역은 group API로 묶어서 가져옴 (20곳당 요청 1번)
+    if get_city_table():
+        batchable = [locality for locality in localities if 'id' in resolve_weather_request(locality)[1]]
+        if batchable:
+            results, errors = await asyncio.to_thread(get_weather_batch, batchable)
+            for locality in batchable:
+                yield locality, results.get(locality), errors.get(locality)
+            batched = set(batchable)
+            localities = [locality for locality in localities if locality not in batched]
+    
+    tasks = [asyncio.create_task(fetch_one(locality)) for locality in localities]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # 중간에 중단되면 남은 작업 취소
+        for task in tasks:
+            task.cancel()
+
+def fetch_weather_many(localities, concurrency=FETCH_CONCURRENCY, timeout=FETCH_TIMEOUT):
+    """fetch_weather_stream의 동기 래퍼 ({지역명: 데이터}, {지역명: 오류 메시지}) 반환"""
+    async def collect():
+        results = {}
+        errors = {}
+        async for locality, weather_data, error in fetch_weather_stream(localities, concurrency, timeout):
+            if error:
+                errors[locality] = error
+            else:
+                results[locality] = weather_data
+        return results, errors
+    
+    return asyncio.run(collect())
+
+def get_region_localities(region):
+    """get_city_categories()의 지역(도) 이름으로 소속 시/군 목록을 반환하는 함수"""
+    localities = []
+    for city_list in get_city_categories().get(region, {}).values():
+        localities.extend(city_list)
+    return localities
+
+def fetch_region_weather(region, concurrency=FETCH_CONCURRENCY):
+    """한 지역(도)의 모든 시/군 날씨를 동시에 가져오는 함수"""
+    return fetch_weather_many(get_region_localities(region), concurrency)
+
+# OpenWeather 대량 현재 날씨 덤프 파일 (예: weather_14.json.gz, 시작 시 캐시에 적재)
+BULK_WEATHER_FILE = os.getenv("WEATHER_BULK_FILE", "")
+BULK_INGEST_CHUNK_SIZE = 500  # 캐시/디스크에 한 번에 기록할 스냅샷 수
+BULK_WEATHER_UNITS = os.getenv("WEATHER_BULK_UNITS", "standard")  # 덤프 파일 단위 (standard: 켈빈, metric, imperial)
+BULK_TEMPERATURE_FIELDS = ('temp', 'feels_like', 'temp_min', 'temp_max')
+# 단위 -> (기온 기준점, 기온 배율, 풍속 배율): 섭씨 = (값 - 기준점) x 배율, m/s = 값 x 풍속 배율
+BULK_UNIT_CONVERSIONS = {
+    'standard': (273.15, 1.0, 1.0),
+    'metric': (0.0, 1.0, 1.0),
+    'imperial': (32.0, 5 / 9, 0.44704)
+}
+
+def read_bulk_lines(path):
+    """덤프 파일을 한 줄씩 읽는 생성기 (.gz 파일은 스트리밍으로 압축 해제)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+def parse_bulk_records(lines):
+    """각 줄을 JSON으로 파싱하는 생성기 (잘못된 줄은 건너뜀)"""
+    for line in lines:
+        try:
+            yield decode_json(line)
+        except ValueError:
+            continue
+
+def bulk_record_to_api(record):
+    """대량 덤프 레코드({"city": ..., "time": ..., "main": ...})를 현재 날씨 API 응답 형태로 변환하는 함수"""
+    if 'city' not in record:
+        # 이미 현재 날씨 API 형태인 경우
+        return record
+    city = record['city']
+    data = {
+        'id': city.get('id'),
+        'name': city.get('name'),
+        'coord': city.get('coord', {}),
+        'sys': {'country': city.get('country')},
+        'dt': record.get('time', record.get('dt'))
+    }
+    for field in ('main', 'wind', 'clouds', 'weather', 'visibility', 'rain', 'snow'):
+        if field in record:
+            data[field] = record[field]
+    return data
+
+def bulk_units_to_metric(data, units=BULK_WEATHER_UNITS):
+    """덤프 파일 단위(켈빈, 화씨/mph)의 기온과 풍속을 캐시에 쓰는 metric 단위(섭씨, m/s)로 바꾼 사본을 반환하는 함수"""
+    if units not in BULK_UNIT_CONVERSIONS:
+        raise ValueError(f"지원하지 않는 덤프 파일 단위입니다: {units}")
+    if units == 'metric':
+        return data
+    temperature_offset, temperature_scale, speed_scale = BULK_UNIT_CONVERSIONS[units]
+    
+    data = dict(data)
+    if isinstance(data.get('main'), dict):
+        main_data = data['main'] = dict(data['main'])
+        for field in BULK_TEMPERATURE_FIELDS:
+            if isinstance(main_data.get(field), (int, float)):
+                main_data[field] = round((main_data[field] - temperature_offset) * temperature_scale, 2)
+    if isinstance(data.get('wind'), dict):
+        wind_data = data['wind'] = dict(data['wind'])
+        for field in ('speed', 'gust'):
+            if isinstance(wind_data.get(field), (int, float)):
+                wind_data[field] = round(wind_data[field] * speed_scale, 2)
+    return data
+
+def filter_known_localities(records, units=BULK_WEATHER_UNITS):
+    """지역 색인과 도시 ID 변환표에 있는 지역만 metric 단위로 바꿔 (캐시 키, 스냅샷)으로 내보내는 생성기"""
+    known_ids = {entry.city_id for entry in get_city_table().values()}
+    # 영문 도시명 -> 지역 색인 검색어 (예: "Seoul" -> "Seoul,KR")
+    known_queries = get_locality_index().known_queries()
+    
+    for record in records:
+        data = bulk_record_to_api(record)
+        if data.get('sys', {}).get('country') not in (None, 'KR'):
+            continue
+        if data.get('id') in known_ids or data.get('name') in known_queries:
+            data = bulk_units_to_metric(data, units)
+        if data.get('id') in known_ids:
+            yield make_cache_key({'id': data['id']}), WeatherSnapshot.from_api(data)
+        elif data.get('name') in known_queries:
+            yield make_cache_key({'q': known_queries[data['name']]}), WeatherSnapshot.from_api(data)
+
+def ingest_bulk_file(path, weather_cache=None, units=BULK_WEATHER_UNITS):
+    """대량 덤프 파일을 일정한 메모리로 스트리밍하여 날씨 캐시에 적재하고, 적재한 스냅샷 수를 반환하는 함수
+    
+    각 스냅샷은 적재한 시각이 아니라 레코드의 관측 시각(dt/time)으로 저장하므로 캐시 TTL이 그대로 적용됩니다.
+    관측 시각이 없거나 이미 TTL보다 오래된 레코드, 캐시에 더 최근 값이 있는 지역은 건너뜁니다.
+    """
+    weather_cache = weather_cache if weather_cache is not None else get_weather_cache()
+    count = 0
+    chunk = []
+    for cache_key, weather_data in filter_known_localities(parse_bulk_records(read_bulk_lines(path)), units):
+        now = time.time()
+        if not isinstance(weather_data.dt, (int, float)) or now - weather_data.dt > weather_cache.ttl:
+            continue
+        # 시계 차이로 관측 시각이 미래인 경우 현재 시각으로 저장
+        observed_at = min(weather_data.dt, now)
+        _, age = weather_cache.peek(cache_key)
+        if age is not None and now - age >= observed_at:
+            continue
+        chunk.append((cache_key, weather_data, observed_at))
+        if len(chunk) >= BULK_INGEST_CHUNK_SIZE:
+            weather_cache.set_entries(chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        weather_cache.set_entries(chunk)
+        count += len(chunk)
+    return count
+
+# 주변 관측값으로 동/읍/면 날씨를 추정하는 역거리 가중(IDW) 보간 설정
+IDW_POWER = float(os.getenv("WEATHER_IDW_POWER", "2"))
+IDW_RADIUS_KM = float(os.getenv("WEATHER_IDW_RADIUS_KM", "40"))  # 이 거리 밖의 관측값은 사용하지 않음
+IDW_CONFIDENCE_SCALE_KM = 15.0  # 가중 평균 거리가 이만큼이면 거리 신뢰도 약 0.37
+IDW_EXACT_KM = 0.5  # 이 거리 안에 관측 지점이 있으면 추정하지 않고 관측값 그대로 사용
+# 보간하는 값과 신뢰도 계산 시 허용 편차 (주변 관측값이 이만큼 퍼져 있으면 일치 신뢰도 0.5)
+IDW_FIELDS = ('temp', 'humidity', 'wind_speed', 'pressure')
+IDW_TOLERANCES = (2.0, 10.0, 2.0, 3.0)
+
+def idw_interpolate(target_lat, target_lon, obs_lat, obs_lon, obs_values,
+                    power=IDW_POWER, radius_km=IDW_RADIUS_KM):
+    """관측값 배열로 여러 지점의 값을 한 번에 추정하는 함수 (NumPy 필요)
+    
+    target_*: (M,) 추정할 지점, obs_*: (N,) 관측 지점, obs_values: (N, F) 관측값
+    (추정값 (M, F), 신뢰도 0~1 (M, F), 추정 여부 (M,), 가장 가까운 관측 지점 거리 km (M,))를 반환합니다.
+    반경 안에 관측값이 없는 지점은 추정값이 NaN, 신뢰도가 0입니다.
+    """
+    if np is None:
+        raise ImportError("날씨 보간에는 numpy가 필요합니다 (pip install numpy)")
+    
+    target_lat = np.radians(np.asarray(target_lat, dtype=float))[:, None]
+    target_lon = np.radians(np.asarray(target_lon, dtype=float))[:, None]
+    obs_lat = np.radians(np.asarray(obs_lat, dtype=float))[None, :]
+    obs_lon = np.radians(np.asarray(obs_lon, dtype=float))[None, :]
+    obs_values = np.asarray(obs_values, dtype=float)
+    if obs_values.ndim == 1:
+        obs_values = obs_values[:, None]
+    field_count = obs_values.shape[1]
+    if obs_lat.shape[1] == 0:
+        empty = np.full((target_lat.shape[0], field_count), np.nan)
+        return empty, np.zeros_like(empty), np.ones(target_lat.shape[0], dtype=bool), np.full(target_lat.shape[0], np.inf)
+    
+    # (M, N) 거리 행렬 (하버사인)
+    a = (np.sin((obs_lat - target_lat) / 2) ** 2
+         + np.cos(target_lat) * np.cos(obs_lat) * np.sin((obs_lon - target_lon) / 2) ** 2)
+    distances = 6371.0 * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    nearest_km = distances.min(axis=1)
+    
+    # 반경 밖은 가중치 0, 관측 지점과 거의 같은 위치는 그 관측값만 사용
+    with np.errstate(divide='ignore'):
+        weights = np.where(distances <= radius_km, 1.0 / np.maximum(distances, 1e-6) ** power, 0.0)
+    exact = distances <= IDW_EXACT_KM
+    exact_rows = exact.any(axis=1)
+    weights[exact_rows] = exact[exact_rows].astype(float)
+    
+    weight_sums = weights.sum(axis=1, keepdims=True)
+    has_neighbors = weight_sums[:, 0] > 0
+    normalized = np.divide(weights, weight_sums, out=np.zeros_like(weights), where=weight_sums > 0)
+    estimates = normalized @ obs_values
+    estimates[~has_neighbors] = np.nan
+    
+    # 신뢰도 = 거리 신뢰도(가중 평균 거리) x 일치 신뢰도(주변 관측값의 가중 표준편차)
+    mean_distance = (normalized * distances).sum(axis=1, keepdims=True)
+    distance_confidence = np.exp(-mean_distance / IDW_CONFIDENCE_SCALE_KM)
+    spread = np.sqrt(np.maximum(normalized @ obs_values ** 2 - np.nan_to_num(estimates) ** 2, 0.0))
+    tolerances = np.resize(np.asarray(IDW_TOLERANCES, dtype=float), field_count)
+    confidence = distance_confidence / (1.0 + spread / tolerances)
+    confidence[exact_rows] = 1.0
+    confidence[~has_neighbors] = 0.0
+    return estimates, confidence, ~exact_rows, nearest_km
+
+def get_cached_observations():
+    """캐시에 있는 유효한 관측값 중 좌표가 있는 것을 (위도, 경도, 값 목록, 도시명) 목록으로 반환하는 함수 (같은 지점은 한 번만)"""
+    observations = {}
+    for weather_data in get_weather_cache().fresh_values():
+        if weather_data.lat is None or weather_data.lon is None or weather_data.validation_error:
+            continue
+        values = [getattr(weather_data, field) for field in IDW_FIELDS]
+        if None in values:
+            continue
+        observations[(weather_data.lat, weather_data.lon)] = (weather_data.lat, weather_data.lon, values, weather_data.name)
+    return list(observations.values())
+
+def get_target_coordinates(locality):
+    """보간할 지역 자신의 좌표를 찾는 함수 (없으면 None)
+    
+    변환표에서 직접 찾은 좌표를 쓰고, 변환표 항목이 없으면 그 지역의 검색어로 받아 캐시된 관측 지점 좌표를 씁니다.
+    상위 지역에서 물려받은 좌표는 그 지역의 위치가 아니므로 쓰지 않습니다
+    (상위 지역의 관측 지점에 겹쳐 관측값으로 잘못 표시되는 것을 막음).
+    """
+    city_entry = get_city_table().get(locality.id)
+    if city_entry is not None:
+        return None if city_entry.inherited else (city_entry.lat, city_entry.lon)
+    if not locality.query:
+        return None
+    cached_data, _ = get_weather_cache().peek(make_cache_key({'q': locality.query}))
+    if cached_data is not None and cached_data.lat is not None and cached_data.lon is not None:
+        return cached_data.lat, cached_data.lon
+    return None
+
+def estimate_weather(localities):
+    """여러 지역의 날씨를 API 요청 없이 캐시된 관측값으로 추정하는 함수
+    
+    localities는 지역 색인의 Locality 목록이며, 자신의 좌표를 알 수 있는 지역마다 (get_target_coordinates 참고)
+    {'locality', 'lat', 'lon', 필드값..., 필드_confidence..., 'estimated', 'nearest_km'} 딕셔너리를 반환합니다.
+    """
+    targets = []
+    for locality in localities:
+        coordinates = get_target_coordinates(locality)
+        if coordinates:
+            targets.append((locality, coordinates[0], coordinates[1]))
+    observations = get_cached_observations()
+    if not targets:
+        return []
+    
+    estimates, confidence, estimated, nearest_km = idw_interpolate(
+        [lat for _, lat, _ in targets], [lon for _, _, lon in targets],
+        [obs[0] for obs in observations], [obs[1] for obs in observations],
+        [obs[2] for obs in observations] or np.empty((0, len(IDW_FIELDS)))
+    )
+    
+    rows = []
+    for row, (locality, lat, lon) in enumerate(targets):
+        result = {'locality': locality, 'lat': lat, 'lon': lon,
+                  'estimated': bool(estimated[row]), 'nearest_km': float(nearest_km[row])}
+        for column, field in enumerate(IDW_FIELDS):
+            value = estimates[row, column]
+            result[field] = None if np.isnan(value) else round(float(value), 1)
+            result[f'{field}_confidence'] = round(float(confidence[row, column]), 2)
+        rows.append(result)
+    return rows
+
+@shared_resource
+def get_city_categories():
+    """지역 색인의 도시를 지역(도)별 시/군(특별시/광역시는 시 이름별)으로 분류한 딕셔너리를 반환하는 함수 (처음 한 번만 생성)"""
+    locality_index = get_locality_index()
+    categories = {}
+    for region in locality_index.roots():
+        cities = locality_index.children(region.id)
+        if region.name == "특별시/광역시":
+            categories[region.name] = {city.name: (strip_admin_suffix(city.name),) for city in cities}
+        else:
+            categories[region.name] = {
+                category: tuple(strip_admin_suffix(city.name) for city in cities if city.name.endswith(category))
+                for category in ("시", "군")
+            }
+    return categories
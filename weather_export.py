@@ -0,0 +1,180 @@
+"""
+지역별 현재 날씨 내보내기 스크립트
+
+weather_core의 캐시/요청 제한/동시 조회를 그대로 사용하여 한 지역(도)의 모든 시/군 날씨를
+가져오고, 조회가 끝나는 순서대로 CSV/NDJSON 행을 표준 출력 또는 파일로 내보냅니다.
+
+사용 예:
+    python weather_export.py --region 경기도 --format csv
+    python weather_export.py --region 경기도 --region 강원도 --format ndjson --output gyeonggi.ndjson
+    python weather_export.py --region all --format parquet --output korea.parquet   # pyarrow 필요
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+
+import weather_core
+from weather_core import FETCH_CONCURRENCY, FETCH_TIMEOUT, WeatherSnapshot, fetch_weather_stream, get_city_categories
+
+# 내보내는 열 (지역 정보 + 날씨 필드 + 오류 메시지)
+EXPORT_FIELDS = ['region', 'locality'] + [
+    field for field in WeatherSnapshot.__slots__ if field not in ('validation_error', 'stale_age')
+] + ['stale_age', 'error']
+
+
+def to_row(region, locality, weather_data, error):
+    """조회 결과 하나를 내보낼 행(딕셔너리)으로 변환하는 함수"""
+    row = dict.fromkeys(EXPORT_FIELDS)
+    row['region'] = region
+    row['locality'] = locality
+    if weather_data is not None:
+        for field in EXPORT_FIELDS[2:-1]:
+            row[field] = getattr(weather_data, field)
+        row['missing_fields'] = ','.join(weather_data.missing_fields or ()) or None
+        error = error or weather_data.validation_error
+    row['error'] = error
+    return row
+
+
+async def iter_rows(regions, concurrency, timeout):
+    """지역들의 날씨를 동시에 조회하여 완료되는 순서대로 행을 내보내는 비동기 생성기"""
+    categories = get_city_categories()
+    region_of = {}
+    for region in regions:
+        for city_list in categories[region].values():
+            for locality in city_list:
+                region_of.setdefault(locality, region)
+
+    async for locality, weather_data, error in fetch_weather_stream(list(region_of), concurrency, timeout):
+        yield to_row(region_of[locality], locality, weather_data, error)
+
+
+class CSVWriter:
+    """행을 받는 즉시 CSV로 기록하는 클래스"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.stream.flush()
+
+    def close(self):
+        self.stream.flush()
+
+
+class NDJSONWriter:
+    """행을 받는 즉시 한 줄짜리 JSON으로 기록하는 클래스"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, row):
+        self.stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        self.stream.flush()
+
+
+class ParquetWriter:
+    """행을 일정 개수씩 모아 Parquet 행 그룹으로 기록하는 클래스 (pyarrow 필요)"""
+
+    def __init__(self, path, batch_size=64):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.batch_size = batch_size
+        self.rows = []
+        # 실패한 지역은 날씨 필드가 비어 있으므로 열 타입을 미리 고정
+        string_fields = {'region', 'locality', 'name', 'country', 'weather_main', 'description', 'icon', 'missing_fields', 'error'}
+        int_fields = {'city_id', 'dt', 'humidity', 'pressure', 'wind_deg', 'weather_id', 'sunrise', 'sunset', 'clouds'}
+        self.schema = pa.schema([
+            (field, pa.string() if field in string_fields else pa.int64() if field in int_fields else pa.float64())
+            for field in EXPORT_FIELDS
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self.rows:
+            self.writer.write_table(self.pa.Table.from_pylist(self.rows, schema=self.schema))
+            self.rows = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+async def export(regions, writer, concurrency, timeout):
+    """조회가 끝나는 순서대로 행을 기록하고 (성공 수, 실패 수)를 반환하는 함수"""
+    succeeded = failed = 0
+    async for row in iter_rows(regions, concurrency, timeout):
+        writer.write(row)
+        if row['error']:
+            failed += 1
+        else:
+            succeeded += 1
+    return succeeded, failed
+
+
+def main(argv=None):
+    regions = list(get_city_categories())
+    parser = argparse.ArgumentParser(description="지역별 현재 날씨를 CSV/NDJSON/Parquet으로 내보내기")
+    parser.add_argument("--region", action="append", required=True,
+                        help=f"내보낼 지역 (여러 번 지정 가능, 'all'은 전체): {', '.join(regions)}")
+    parser.add_argument("--format", choices=["csv", "ndjson", "parquet"], default="csv", help="출력 형식")
+    parser.add_argument("--output", help="출력 파일 경로 (기본: 표준 출력, parquet은 필수)")
+    parser.add_argument("--concurrency", type=int, default=FETCH_CONCURRENCY, help="동시에 조회할 지역 수")
+    parser.add_argument("--timeout", type=float, default=FETCH_TIMEOUT, help="지역당 제한 시간 (초)")
+    args = parser.parse_args(argv)
+
+    selected = regions if "all" in args.region else args.region
+    unknown = [region for region in selected if region not in regions]
+    if unknown:
+        parser.error(f"알 수 없는 지역: {', '.join(unknown)}")
+    if not weather_core.API_KEY:
+        parser.error("OPENWEATHER_API_KEY 환경변수가 필요합니다")
+    if args.format == "parquet" and not args.output:
+        parser.error("parquet 형식은 --output이 필요합니다")
+
+    stream = None
+    if args.format == "parquet":
+        try:
+            writer = ParquetWriter(args.output)
+        except ImportError:
+            parser.error("parquet 형식을 사용하려면 pyarrow를 설치하세요 (pip install pyarrow)")
+    else:
+        stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        writer = CSVWriter(stream) if args.format == "csv" else NDJSONWriter(stream)
+
+    try:
+        succeeded, failed = asyncio.run(export(selected, writer, args.concurrency, args.timeout))
+    except BrokenPipeError:
+        # `| head` 등으로 출력이 먼저 닫힌 경우 조용히 종료
+        # (표준 출력 fd를 /dev/null로 바꿔 아래 writer.close()와 종료 시 flush가 다시 실패하지 않게 함)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+        return 0
+    finally:
+        writer.close()
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+
+    print(f"{succeeded}개 지역 완료, {failed}개 지역 실패", file=sys.stderr)
+    return 0 if succeeded or not failed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
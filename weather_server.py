@@ -0,0 +1,434 @@
+"""
+날씨 JSON API 서버
+
+Streamlit 화면을 거치지 않고 weather_core의 지역명 변환/캐시/요청 제한을 그대로 사용하여
+날씨를 JSON으로 제공합니다. 캐시에 있는 지역은 API 요청 없이 바로 응답합니다.
+
+엔드포인트:
+    GET  /weather?city=수원                  한 지역 날씨 (동/읍/면은 상위 지역 기준, id=지역 ID로 동명 지역 구분)
+    GET  /weather/batch?city=수원&city=용인   여러 지역 날씨 (cities=수원,용인 도 가능)
+    GET  /weather/batch?region=경기도         한 지역(도)의 모든 시/군 날씨
+    POST /weather/batch  {"cities": [...]}   여러 지역 날씨
+    GET  /weather?lat=37.50&lon=127.04       좌표에서 가장 가까운 지역 날씨 (도시 ID 변환표 필요)
+    GET  /nearby?lat=37.50&lon=127.04&radius=5  좌표 반경(km) 안의 지역 목록 (가까운 순서)
+    GET  /suggest?q=역ㅅ                      지역명 자동 완성 (초성/오타 허용)
+    GET  /healthz                            상태 및 캐시 통계
+
+사용 예:
+    python weather_server.py --port 8080
+    curl 'http://localhost:8080/weather?city=수원'
+"""
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sys
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+import weather_core
+from weather_core import (
+    NEARBY_RADIUS_KM,
+    WEATHER_CACHE_MAX_SIZE,
+    WeatherAPIError,
+    fetch_weather_data,
+    fetch_weather_many,
+    get_city_categories,
+    get_city_table,
+    get_korean_city_name,
+    get_locality_index,
+    get_locality_search,
+    get_locality_tree,
+    get_rate_limiter,
+    get_region_localities,
+    get_weather_cache,
+    resolve_locality,
+    resolve_weather_request,
+)
+
+# 서버 설정
+API_SERVER_HOST = os.getenv("WEATHER_API_HOST", "127.0.0.1")
+API_SERVER_PORT = int(os.getenv("WEATHER_API_PORT", "8080"))
+API_MAX_BATCH = int(os.getenv("WEATHER_API_MAX_BATCH", "100"))  # 한 번에 조회할 수 있는 최대 지역 수
+API_MAX_BODY = 64 * 1024  # POST 본문 최대 크기 (bytes)
+API_READ_TIMEOUT = 30  # 요청을 읽을 때 소켓 대기 제한 시간 (초), 유휴 keep-alive 연결도 이 시간 뒤 닫힘
+
+# WeatherAPIError 상태 코드 -> 응답 상태 코드 (API 키 오류 등은 서버 측 문제이므로 502)
+ERROR_STATUS = {404: 404, 429: 429}
+
+
+def snapshot_to_json(city, weather_data, resolved_city=None):
+    """날씨 데이터를 API 응답용 딕셔너리로 변환하는 함수 (resolved_city: 실제로 조회한 상위 지역명)"""
+    body = weather_data.to_dict()
+    body['query'] = city
+    body['resolved'] = resolved_city or city
+    body['korean_name'] = get_korean_city_name(weather_data.name) if weather_data.name else None
+    body['stale_age'] = weather_data.stale_age
+    body['distance_km'] = weather_data.distance_km
+    return body
+
+
+@functools.lru_cache(maxsize=WEATHER_CACHE_MAX_SIZE)
+def encode_cached_weather(city, resolved_city, weather_data):
+    """캐시에 저장된 스냅샷의 응답 본문(bytes)을 만드는 함수 (같은 캐시 값은 한 번만 직렬화)"""
+    return json.dumps(snapshot_to_json(city, weather_data, resolved_city), ensure_ascii=False).encode("utf-8")
+
+
+def encode_weather(city, resolved_city, weather_data):
+    """지역명과 날씨 데이터로 응답 본문(bytes)을 만드는 함수
+
+    경과 시간(stale_age)이나 거리(distance_km)를 붙인 사본은 요청마다 새로 만들어지므로
+    인코딩 캐시에 넣지 않고 바로 직렬화합니다 (캐시된 원본의 인코딩 결과가 밀려나지 않도록).
+    """
+    if weather_data.stale_age is None and weather_data.distance_km is None:
+        return encode_cached_weather(city, resolved_city, weather_data)
+    return json.dumps(snapshot_to_json(city, weather_data, resolved_city), ensure_ascii=False).encode("utf-8")
+
+
+def cache_max_age(city, locality_id=None):
+    """캐시에 남은 유효 시간(초)을 반환하는 함수 (캐시에 없거나 만료되었으면 0)"""
+    weather_cache = get_weather_cache()
+    _, age = weather_cache.peek(resolve_weather_request(city, locality_id)[2])
+    if age is None:
+        return 0
+    return max(0, int(weather_cache.ttl - age))
+
+
+def cache_headers(etag, last_modified, max_age):
+    """ETag/Last-Modified/Cache-Control 응답 헤더를 만드는 함수"""
+    headers = {"ETag": etag}
+    if last_modified:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+    # 유효 시간이 지났거나 오래된 값(stale)이면 매번 ETag로 재검증하도록 함
+    headers["Cache-Control"] = f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+    return headers
+
+
+def single_etag(weather_data):
+    """관측 시각(dt)과 도시 ID로 ETag를 만드는 함수"""
+    return f'W/"{weather_data.city_id or weather_data.name}-{weather_data.dt}"'
+
+
+def batch_etag(results):
+    """여러 지역의 관측 시각(dt)으로 ETag를 만드는 함수"""
+    digest = hashlib.blake2b(digest_size=12)
+    for city in sorted(results):
+        digest.update(f"{city}\0{results[city].city_id}\0{results[city].dt}\n".encode("utf-8"))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def get_cached_many(cities):
+    """캐시에 유효한 값이 있는 지역은 바로 꺼내고, 나머지 지역 목록을 함께 반환하는 함수"""
+    weather_cache = get_weather_cache()
+    results = {}
+    missing = []
+    for city in cities:
+        _, _, cache_key, coordinates = resolve_weather_request(city)
+        weather_data = weather_cache.get(cache_key)
+        if weather_data is not None:
+            results[city] = weather_data if coordinates is None else weather_data.with_distance(*coordinates)
+        else:
+            missing.append(city)
+    return results, missing
+
+
+class WeatherRequestHandler(BaseHTTPRequestHandler):
+    """날씨 JSON API 요청을 처리하는 클래스"""
+
+    protocol_version = "HTTP/1.1"  # 연결 재사용 (keep-alive)
+    disable_nagle_algorithm = True  # 헤더와 본문을 나눠 보낼 때 생기는 지연(Nagle + delayed ACK) 방지
+    server_version = "WeatherAPI/1.0"
+    timeout = API_READ_TIMEOUT  # 본문을 덜 보내거나 멈춘 연결이 작업 스레드를 붙잡지 않도록 읽기 제한
+    quiet = False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/weather":
+            self.handle_weather(query)
+        elif url.path == "/weather/batch":
+            self.handle_batch(query_cities(query), query.get("region", [None])[0])
+        elif url.path == "/suggest":
+            self.handle_suggest(query)
+        elif url.path == "/nearby":
+            self.handle_nearby(query)
+        elif url.path == "/healthz":
+            self.send_json(200, {
+                "status": "ok",
+                "api_key": bool(weather_core.API_KEY),
+                "city_table": len(get_city_table()),
+                "cache": get_weather_cache().stats(),
+                "rate_limiter": get_rate_limiter().stats()
+            })
+        else:
+            self.send_error_json(404, "알 수 없는 경로입니다.")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/weather/batch":
+            self.send_error_json(404, "알 수 없는 경로입니다.")
+            return
+
+        # 본문을 읽지 않고 거절하면 남은 본문이 다음 요청으로 읽히지 않도록 연결을 닫음
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            self.send_error_json(411, "Content-Length 헤더가 필요합니다.")
+            return
+        if not (length.isascii() and length.isdigit()):
+            self.close_connection = True
+            self.send_error_json(400, "Content-Length 헤더가 올바르지 않습니다.")
+            return
+        length = int(length)
+        if length > API_MAX_BODY:
+            self.close_connection = True
+            self.send_error_json(413, "요청 본문이 너무 큽니다.")
+            return
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_error_json(400, "요청 본문이 올바른 JSON이 아닙니다.")
+            return
+        if not isinstance(payload, dict):
+            self.send_error_json(400, "요청 본문은 JSON 객체여야 합니다.")
+            return
+        cities = payload.get("cities")
+        if cities is not None and not (isinstance(cities, list) and all(isinstance(city, str) for city in cities)):
+            self.send_error_json(400, "cities는 문자열 목록이어야 합니다.")
+            return
+        region = payload.get("region")
+        if region is not None and not isinstance(region, str):
+            self.send_error_json(400, "region은 문자열이어야 합니다.")
+            return
+        self.handle_batch([city.strip() for city in cities or [] if city.strip()], region)
+
+    def handle_weather(self, query):
+        """GET /weather 처리"""
+        city = (query.get("city", [""])[0]).strip()
+        locality_id = query.get("id", [None])[0]
+        distance_from = None
+        if not city and locality_id is None and "lat" in query:
+            # 좌표는 가장 가까운 지역으로 바꾸어 지역명 기준 캐시를 그대로 사용
+            try:
+                distance_from = query_coordinates(query)
+            except ValueError as e:
+                self.send_error_json(400, str(e))
+                return
+            nearest = get_locality_tree().nearest(*distance_from)
+            if not nearest:
+                self.send_error_json(404, "좌표 검색에는 도시 ID 변환표가 필요합니다.")
+                return
+            locality_id = str(nearest[0][0].id)
+        if locality_id is not None:
+            # /suggest가 돌려준 지역 ID (같은 이름의 여러 지역 구분용)
+            if not (locality_id.isascii() and locality_id.isdigit()) or int(locality_id) >= len(get_locality_index()):
+                self.send_error_json(400, "id 파라미터가 올바르지 않습니다.")
+                return
+            locality_id = int(locality_id)
+            city = city or get_locality_index().get(locality_id).name
+        if not city:
+            self.send_error_json(400, "city 파라미터가 필요합니다.")
+            return
+
+        try:
+            weather_data = fetch_weather_data(city, refresh=query.get("refresh", ["0"])[0] == "1", locality_id=locality_id)
+        except WeatherAPIError as e:
+            status = ERROR_STATUS.get(e.status_code, 502)
+            self.send_error_json(status, str(e), {"Retry-After": "60"} if status == 429 else None)
+            return
+        except requests.exceptions.Timeout:
+            self.send_error_json(504, "날씨 서버 응답 시간이 초과되었습니다.")
+            return
+        except requests.exceptions.RequestException as e:
+            self.send_error_json(502, f"네트워크 오류: {e}")
+            return
+        except ValueError as e:
+            self.send_error_json(502, f"JSON 파싱 오류: {e}")
+            return
+
+        if weather_data.validation_error:
+            self.send_error_json(502, weather_data.validation_error)
+            return
+
+        etag = single_etag(weather_data)
+        max_age = 0 if weather_data.stale_age is not None else cache_max_age(city, locality_id)
+        headers = cache_headers(etag, weather_data.dt, max_age)
+        if self.not_modified(etag, headers):
+            return
+        if distance_from is not None:
+            # 관측 지점까지의 거리는 요청한 좌표 기준
+            weather_data = weather_data.with_distance(*distance_from)
+        self.send_body(200, encode_weather(city, resolve_locality(city, locality_id), weather_data), headers)
+
+    def handle_nearby(self, query):
+        """GET /nearby 처리 (좌표 반경 안의 지역 목록, API 요청 없음)"""
+        try:
+            lat, lon = query_coordinates(query)
+        except ValueError as e:
+            self.send_error_json(400, str(e))
+            return
+        try:
+            radius_km = float(query.get("radius", [str(NEARBY_RADIUS_KM)])[0])
+        except ValueError:
+            self.send_error_json(400, "radius는 숫자여야 합니다.")
+            return
+        limit = query.get("limit", ["50"])[0]
+        if not (limit.isascii() and limit.lstrip("-").isdigit()):
+            self.send_error_json(400, "limit는 정수여야 합니다.")
+            return
+        # 음수나 0은 1개로, 너무 큰 값은 500개로 제한 (음수로 목록 뒤쪽이 잘리지 않도록)
+        limit = min(max(int(limit), 1), 500)
+        if not 0 < radius_km <= 500:
+            self.send_error_json(400, "radius는 0보다 크고 500 이하여야 합니다.")
+            return
+        locality_index = get_locality_index()
+        self.send_json(200, {"localities": [
+            {"id": locality.id, "name": locality.name, "path": locality_index.path_names(locality.id),
+             "distance_km": round(distance_km, 2)}
+            for locality, distance_km in get_locality_tree().within(lat, lon, radius_km)[:limit]
+        ]}, {"Cache-Control": "public, max-age=3600"})
+
+    def handle_suggest(self, query):
+        """GET /suggest 처리 (입력 중인 검색어의 추천 지역 목록)"""
+        locality_search = get_locality_search()
+        try:
+            limit = min(int(query.get("limit", ["8"])[0]), 50)
+        except ValueError:
+            limit = 8
+        suggestions = locality_search.search(query.get("q", [""])[0], limit)
+        self.send_json(200, {"suggestions": [
+            {"id": locality.id, "name": locality.name, "label": locality_search.label(locality),
+             "path": locality_search.locality_index.path_names(locality.id)}
+            for locality in suggestions
+        ]}, {"Cache-Control": "public, max-age=3600"})
+
+    def handle_batch(self, cities, region=None):
+        """GET/POST /weather/batch 처리"""
+        if region:
+            if region not in get_city_categories():
+                self.send_error_json(404, f"알 수 없는 지역입니다: {region}")
+                return
+            cities = cities + get_region_localities(region)
+        cities = list(dict.fromkeys(cities))
+        if not cities:
+            self.send_error_json(400, "city, cities 또는 region 파라미터가 필요합니다.")
+            return
+        if len(cities) > API_MAX_BATCH:
+            self.send_error_json(400, f"한 번에 최대 {API_MAX_BATCH}개 지역까지 조회할 수 있습니다.")
+            return
+
+        # 캐시에 있는 지역은 바로 사용하고 나머지는 group API로 묶거나 동시에 조회
+        results, missing = get_cached_many(cities)
+        errors = {}
+        if missing:
+            fetched, errors = fetch_weather_many(missing)
+            results.update(fetched)
+        for city, weather_data in list(results.items()):
+            if weather_data.validation_error:
+                errors[city] = weather_data.validation_error
+                del results[city]
+
+        etag = batch_etag(results)
+        if errors or not results or any(weather_data.stale_age is not None for weather_data in results.values()):
+            max_age = 0
+        else:
+            max_age = min(cache_max_age(city) for city in results)
+        last_modified = max((weather_data.dt for weather_data in results.values() if weather_data.dt), default=None)
+        headers = cache_headers(etag, last_modified, max_age)
+        if self.not_modified(etag, headers):
+            return
+        self.send_json(200, {
+            "results": {
+                city: snapshot_to_json(city, results[city], resolve_locality(city)) for city in cities if city in results
+            },
+            "errors": errors
+        }, headers)
+
+    def not_modified(self, etag, headers):
+        """If-None-Match가 ETag와 같으면 304 응답을 보내고 True 반환"""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+            self.send_body(304, b"", headers)
+            return True
+        return False
+
+    def send_json(self, status, body, headers=None):
+        self.send_body(status, json.dumps(body, ensure_ascii=False).encode("utf-8"), headers)
+
+    def send_error_json(self, status, message, headers=None):
+        self.send_json(status, {"error": message, "status": status}, dict(headers or {}, **{"Cache-Control": "no-store"}))
+
+    def send_body(self, status, body, headers=None):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+def query_cities(query):
+    """쿼리 문자열의 city(반복 가능)와 cities(쉼표 구분)를 지역명 목록으로 합치는 함수"""
+    cities = list(query.get("city", []))
+    for value in query.get("cities", []):
+        cities.extend(value.split(","))
+    return [city.strip() for city in cities if city.strip()]
+
+
+def query_coordinates(query):
+    """쿼리 문자열의 lat/lon을 (위도, 경도)로 변환하는 함수 (없거나 범위를 벗어나면 ValueError)"""
+    try:
+        lat = float(query["lat"][0])
+        lon = float(query["lon"][0])
+    except (KeyError, ValueError):
+        raise ValueError("lat, lon 파라미터가 필요합니다.")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("lat, lon 값이 범위를 벗어났습니다.")
+    return lat, lon
+
+
+def make_server(host=API_SERVER_HOST, port=API_SERVER_PORT, quiet=False):
+    """날씨 JSON API 서버를 만드는 함수 (serve_forever()로 실행)"""
+    handler = type("Handler", (WeatherRequestHandler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="날씨 JSON API 서버")
+    parser.add_argument("--host", default=API_SERVER_HOST, help="바인딩할 주소")
+    parser.add_argument("--port", type=int, default=API_SERVER_PORT, help="포트 번호")
+    parser.add_argument("--quiet", action="store_true", help="요청 로그를 출력하지 않음")
+    args = parser.parse_args(argv)
+
+    if not weather_core.API_KEY:
+        parser.error("OPENWEATHER_API_KEY 환경변수가 필요합니다")
+
+    if not get_city_table():
+        print("도시 ID 변환표(data/city_table.json)가 없어 좌표 검색(/nearby, lat/lon)과 도시 ID 일괄 조회가 꺼져 있습니다. "
+              "python build_city_table.py로 만들 수 있습니다.", file=sys.stderr)
+    server = make_server(args.host, args.port, args.quiet)
+    print(f"날씨 API 서버 실행 중: http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())